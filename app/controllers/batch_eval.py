@@ -0,0 +1,204 @@
+import os
+import io
+import csv
+import hashlib
+import pickle
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core import load, save_eval
+
+CACHE_DIR = '.park_eval_cache'
+CACHE_FILE = 'batch_eval.pkl'
+CACHE_VERSION = 1
+
+EVAL_ALL_FILE = 'eval_all.csv'
+
+# eval_all.csv の総和列・平均列の対象項目
+SUM_ITEMS = [
+    '検知総数', '車両総数', '入庫見逃し', '出庫見逃し', '誤出庫',
+    '全桁OK', '全桁NG', '全桁NG（見切れ）', '全桁NG（影）',
+    '全桁NG（FP）', '全桁NG（Blur）', '全桁NG（その他）',
+    'GT不明', '再送回数',
+]
+AVG_ITEMS = ['全桁精度（メタごと）', '全桁精度（見切れ/FP抜き）']
+
+
+def find_folders(root: str) -> list[str]:
+    """META（またはt4meta）を持つフォルダを再帰的に探す"""
+    folders = []
+    for dir_path, dir_names, _ in os.walk(root):
+        dir_names[:] = sorted(name for name in dir_names if name != CACHE_DIR)
+        if 'META' in dir_names or 't4meta' in dir_names:
+            folders.append(dir_path)
+            # キャプチャフォルダの中は探さない
+            dir_names[:] = []
+    return folders
+
+
+def fingerprint(path: str) -> str:
+    """evalの入力（META json・label.csv・param.json・roi.json）のファイル名・サイズ・mtimeから作るハッシュ"""
+    h = hashlib.sha1()
+
+    meta_dir = os.path.join(path, 'META')
+    if not os.path.exists(meta_dir):
+        meta_dir = os.path.join(path, 't4meta')
+
+    entries = [entry for entry in os.scandir(meta_dir) if entry.name.endswith('.json')]
+    entries.sort(key=lambda entry: entry.name)
+    for entry in entries:
+        stat = entry.stat()
+        h.update(f'{entry.name}\t{stat.st_size}\t{stat.st_mtime_ns}\n'.encode())
+
+    for name in ('label.csv', 'param.json', 'roi.json'):
+        file_path = os.path.join(path, name)
+        if os.path.exists(file_path):
+            stat = os.stat(file_path)
+            h.update(f'{name}\t{stat.st_size}\t{stat.st_mtime_ns}\n'.encode())
+
+    return h.hexdigest()
+
+
+def evaluate_folder(path: str, use_cache: bool = True, verbose: bool = False):
+    """1フォルダを読み込んで eval.csv を書き出す（プロセスプールから呼ばれる）
+
+    戻り値は (path, eval の結果 または None, エラーメッセージ または None, ログ)。
+    """
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            infos, lots = load(path, use_cache=use_cache)
+            if not infos:
+                return path, None, 'No data', log.getvalue()
+            _, results = save_eval(path, lots, infos)
+    except Exception as e:
+        return path, None, f'{type(e).__name__}: {e}', log.getvalue()
+
+    return path, results, None, log.getvalue() if verbose else ''
+
+
+class BatchCache:
+    """フォルダごとの入力のハッシュと eval の結果をルートフォルダ内に保存する"""
+
+    def __init__(self, root: str):
+        self.cache_path = os.path.join(root, CACHE_DIR, CACHE_FILE)
+        self.entries: dict[str, tuple] = {}
+
+    def read(self):
+        if not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print('[batch cache] Failed to read:', e)
+            return
+
+        if data.get('version') != CACHE_VERSION:
+            return
+        self.entries = data['entries']
+
+    def get(self, folder: str, digest: str):
+        entry = self.entries.get(folder)
+        if entry is None or entry[0] != digest:
+            return None
+        return entry[1]
+
+    def set(self, folder: str, digest: str, results: dict):
+        self.entries[folder] = (digest, results)
+
+    def write(self):
+        data = {'version': CACHE_VERSION, 'entries': self.entries}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print('[batch cache] Failed to write:', e)
+
+
+def run(root: str, workers: int = 0, use_cache: bool = True, force: bool = False, verbose: bool = False):
+    """root以下の全フォルダを評価し、eval.csv と eval_all.csv を書き出す"""
+    folders = find_folders(root)
+    print(f'[batch] Folders: {len(folders)}')
+
+    cache = BatchCache(root)
+    if not force:
+        cache.read()
+
+    results: dict[str, dict] = {}
+    digests: dict[str, str] = {}
+    pending = []
+    for path in folders:
+        folder = os.path.relpath(path, root)
+        digests[path] = fingerprint(path)
+
+        cached = cache.get(folder, digests[path])
+        if cached is not None and os.path.exists(os.path.join(path, 'eval.csv')):
+            results[path] = cached
+        else:
+            pending.append(path)
+
+    print(f'[batch] Skipped (unchanged): {len(folders) - len(pending)}, Evaluate: {len(pending)}')
+
+    def collect(outputs):
+        for path, result, error, log in outputs:
+            if log:
+                print(log, end='')
+            if error is not None:
+                print(f'[batch] Failed: {path} ({error})')
+                continue
+            print(f'[batch] Done: {path}')
+            results[path] = result
+            cache.set(os.path.relpath(path, root), digests[path], result)
+
+    if workers == 1 or len(pending) <= 1:
+        collect(evaluate_folder(path, use_cache, verbose) for path in pending)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            collect(executor.map(evaluate_folder, pending, [use_cache] * len(pending), [verbose] * len(pending)))
+
+    cache.write()
+
+    ordered = [(path, results[path]) for path in folders if path in results]
+    path = save_eval_all(root, ordered)
+    print(f'[batch] Saved: {path}')
+    return path
+
+
+def save_eval_all(root: str, results: list[tuple[str, dict]]):
+    """フォルダごとの eval を横に並べ、総和列と平均列を付けた eval_all.csv を書き出す"""
+    names = [os.path.basename(path) if os.path.basename(path) else path for path, _ in results]
+    items = list(results[0][1].keys()) if results else []
+
+    def numbers(item, i):
+        values = [result[item][i] for _, result in results]
+        return [value for value in values if isinstance(value, (int, float))]
+
+    path = os.path.join(root, EVAL_ALL_FILE)
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+
+        header = ['項目']
+        for name in names:
+            header += [f'{name} meta', f'{name} first']
+        header += ['総和 meta', '総和 first', '平均 meta', '平均 first']
+        writer.writerow(header)
+
+        for item in items:
+            row = [item]
+            for _, result in results:
+                row += list(result[item])
+
+            for i in range(2):
+                row.append(sum(numbers(item, i)) if item in SUM_ITEMS else '')
+            for i in range(2):
+                values = numbers(item, i)
+                row.append(sum(values) / len(values) if item in AVG_ITEMS and values else '')
+
+            writer.writerow(row)
+
+    return path
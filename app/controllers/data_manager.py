@@ -2,22 +2,126 @@ import os
 import csv
 import json
 from datetime import datetime, timezone, timedelta
+from functools import partial
+
+import numpy as np
 
 from app.models.parking_info import ParkingInfo
+from app.models.record_store import RecordStore
+from app.controllers.meta_cache import MetaCache
 from app.types import Status
-from app.utlis import parse_timestamp, format_jst
-
-def load(path: str):
-    # Load metadata json
+from app.utlis import parse_timestamp, format_jst, to_timestamp
+
+# ファイル名の時刻（メタの出力時刻）とjson内のTimeStampのずれの許容幅
+PRUNE_MARGIN_SEC = 600
+
+def extract_rows(json_paths: list[str], min_x=0, min_y=0, max_x=0, max_y=0, workers: int = 0, use_threads: bool = False, keep_json: bool = False):
+    """json_pathsの順序を保ったまま ParkingInfo.extract を実行する（workers >= 2 で並列）"""
+    extract = partial(ParkingInfo.extract, min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y, keep_json=keep_json)
+
+    if workers <= 1 or len(json_paths) < 2:
+        for json_path in json_paths:
+            yield extract(json_path)
+        return
+
+    # 並列読み込みを使わない場合（バッチ実行の各プロセスなど）は読み込まない
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    # プロセス間のやり取りを減らすため、ある程度まとめてワーカーに渡す
+    executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    chunksize = max(1, len(json_paths) // (workers * 16))
+    executor = executor_class(max_workers=workers)
+    try:
+        yield from executor.map(extract, json_paths, chunksize=chunksize)
+    finally:
+        # 途中で読み込みを中止した場合は、未着手の分を取り消す
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def prune_by_file_name(entries: list[os.DirEntry], start_jst: datetime = None, end_jst: datetime = None, margin_sec: float = PRUNE_MARGIN_SEC):
+    """ファイル名先頭のUTC時刻 YYYYMMDDhhmmssSSS で、期間外と確定するjsonを開く前に除外する
+
+    ファイル名の時刻はjson内のTimeStampとずれるため、期間の前後 margin_sec 以内のもの、
+    およびファイル名から時刻が読めないものは残し、読み込み後に TimeStamp で判定する。
+    """
+    start_key = to_timestamp(start_jst - timedelta(seconds=margin_sec)) if start_jst else None
+    end_key = to_timestamp(end_jst + timedelta(seconds=margin_sec)) if end_jst else None
+
+    pruned = []
+    for entry in entries:
+        name_key = entry.name[:17]
+        if len(name_key) == 17 and name_key.isdigit():
+            if start_key and name_key < start_key:
+                continue
+            if end_key and name_key > end_key:
+                continue
+        pruned.append(entry)
+
+    return pruned
+
+def extract_rows_with_cache(path: str, entries: list[os.DirEntry], min_x=0, min_y=0, max_x=0, max_y=0, workers: int = 0, use_threads: bool = False, keep: set[str] = None, keep_json: bool = False):
+    """キャッシュに無い（または更新された）jsonだけをパースし、entriesの順に ParkingInfo.extract の結果を返す
+
+    keep に含まれるファイル名のキャッシュは、今回 entries に無くても（期間外で除外された場合など）残す。
+    途中で読み込みを中止した場合も、それまでにパースした分はキャッシュに書き込む。
+    """
+    cache = MetaCache(path, (min_x, min_y, max_x, max_y))
+    cache.read()
+
+    stats = []
+    rows = []
+    misses = []
+    for i, entry in enumerate(entries):
+        stat = entry.stat()
+        stats.append((entry.name, stat.st_size, stat.st_mtime_ns))
+
+        hit, row = cache.get(entry.name, stat.st_size, stat.st_mtime_ns)
+        rows.append(row)
+        if not hit:
+            misses.append(i)
+
+    print(f'[meta cache] Hit: {len(entries) - len(misses)}, Parsed: {len(misses)}')
+
+    miss_paths = [entries[i].path for i in misses]
+    parsed = extract_rows(miss_paths, min_x, min_y, max_x, max_y, workers, use_threads, keep_json)
+    miss_set = set(misses)
+
+    done = 0
+    try:
+        for i in range(len(entries)):
+            if i in miss_set:
+                rows[i] = next(parsed)
+            done = i + 1
+            yield rows[i]
+    finally:
+        parsed.close()
+
+        if keep is None:
+            keep = {entry.name for entry in entries}
+
+        # 新規・更新ファイルがあるか、削除されたファイルのキャッシュが残っている場合のみ書き直す
+        # （未読み込みのファイルは keep により前回のキャッシュを引き継ぐ）
+        parsed_count = sum(1 for i in misses if i < done)
+        if parsed_count or any(json_file not in keep for json_file in cache.entries):
+            cache.write(stats[:done], rows[:done], keep)
+
+def find_meta_dir(path: str) -> str:
+    """META jsonのフォルダ（ebsimの場合は t4meta、無ければNone）"""
     meta_dir = os.path.join(path, 'META')
     if not os.path.exists(meta_dir):
         # For ebsim
         meta_dir = os.path.join(path, 't4meta')
         if not os.path.exists(meta_dir):
-            return None, None
-    
+            return None
+    return meta_dir
+
+def iter_rows(path: str, meta_dir: str, workers: int = 0, use_threads: bool = False, use_cache: bool = True, keep_json: bool = False):
+    """META jsonを順に読み、(期間内の行 または None, 読み込んだファイル数, ファイル総数) を返す
+
+    途中で止める（ジェネレータを close する）と、未着手のパースを取り消す。
+    """
     threshold_jst = None
     threshold_end_jst = None
+    margin_sec = PRUNE_MARGIN_SEC
     param_json = os.path.join(path, 'param.json')
     if os.path.exists(param_json):
         with open(param_json, "r", encoding="utf-8") as f:
@@ -32,12 +136,17 @@ def load(path: str):
                 threshold_end_jst = datetime.strptime(params['end'], params['format']).replace(tzinfo=JST)
                 print('[param.json] End timestamp:', format_jst(threshold_end_jst))
 
+            if 'prune_margin_sec' in params:
+                margin_sec = float(params['prune_margin_sec'])
+
     
-    json_files = [f for f in os.listdir(meta_dir) if f.endswith(".json")]
-    json_files.sort()
+    entries = [entry for entry in os.scandir(meta_dir) if entry.name.endswith(".json")]
+    entries.sort(key=lambda entry: entry.name)
 
-    infos: list[ParkingInfo] = []
-    lots = []
+    all_files = {entry.name for entry in entries}
+    if threshold_jst or threshold_end_jst:
+        entries = prune_by_file_name(entries, threshold_jst, threshold_end_jst, margin_sec)
+        print(f'[param.json] Skipped by file name: {len(all_files) - len(entries)} / {len(all_files)}')
 
     # For ebsim, load ROI
     min_x = 0
@@ -54,58 +163,103 @@ def load(path: str):
                 max_y = roi_data.get("max_y", 0)
                 print(f'ROI loaded: {min_x}, {min_y}, {max_x}, {max_y}')
 
-    for json_file in json_files:
-        info = ParkingInfo.create(os.path.join(meta_dir, json_file), min_x, min_y, max_x, max_y)
-        if info is None:
+    if use_cache:
+        parsed = extract_rows_with_cache(path, entries, min_x, min_y, max_x, max_y, workers, use_threads, all_files, keep_json)
+    else:
+        parsed = extract_rows([entry.path for entry in entries], min_x, min_y, max_x, max_y, workers, use_threads, keep_json)
+
+    total = len(entries)
+    try:
+        for done, row in enumerate(parsed, 1):
+            if row is not None and (threshold_jst or threshold_end_jst):
+                info_jst = parse_timestamp(row['timestamp'])
+                if threshold_jst and info_jst < threshold_jst:
+                    row = None
+                elif threshold_end_jst and info_jst > threshold_end_jst:
+                    row = None
+
+            yield row, done, total
+    finally:
+        parsed.close()
+
+# ラベルcsvの 0/1 の列（status 以外）
+LABEL_FLAGS = ('is_miss_in', 'is_miss_out', 'is_gt_unknown', 'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot', 'is_first')
+
+def label_values(row: dict) -> dict:
+    """ラベルcsvの1行を 列名 -> 値 に変換する（csvに無い列は含めない）"""
+    values = {name: bool(int(row[name])) for name in LABEL_FLAGS if name in row}
+    if 'status' in row:
+        values['status'] = Status(int(row['status']))
+    return values
+
+def set_labels(info: ParkingInfo, row: dict):
+    """ラベルcsvの1行の値を info に設定する"""
+    for name, value in label_values(row).items():
+        setattr(info, name, value)
+
+def load(path: str, workers: int = 0, use_threads: bool = False, use_cache: bool = True, keep_json: bool = False):
+    # Load metadata json
+    meta_dir = find_meta_dir(path)
+    if meta_dir is None:
+        return None, None
+
+    rows = []
+    lots = []
+    for row, _, _ in iter_rows(path, meta_dir, workers, use_threads, use_cache, keep_json):
+        if row is None:
             continue
-        
-        if threshold_jst:
-            info_jst= parse_timestamp(info.timestamp)
-            if info_jst < threshold_jst:
-                continue
 
-        if threshold_end_jst:
-            info_jst= parse_timestamp(info.timestamp)
-            if info_jst > threshold_end_jst:
-                continue
-       
-        infos.append(info)
-        if not info.lot in lots:
-            lots.append(info.lot)
+        rows.append(row)
+        if not row['lot'] in lots:
+            lots.append(row['lot'])
+
+    store = RecordStore(meta_dir)
+    store.extend(rows)
+    infos: list[ParkingInfo] = store.views()
 
     # Load label csv
     label_csv = os.path.join(path, 'label.csv')
     if os.path.exists(label_csv):
-        with open(label_csv, newline='', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            # header = next(reader)
-            for row in reader:
-                match = [info for info in infos if info.json_file == row['json']]
-                if len(match) == 1:
-                    if 'is_miss_in' in row:
-                        match[0].is_miss_in = bool(int(row['is_miss_in']))
-
-                    if 'is_miss_out' in row:
-                        match[0].is_miss_out = bool(int(row['is_miss_out']))
-
-                    if 'is_gt_unknown' in row:
-                        match[0].is_gt_unknown = bool(int(row['is_gt_unknown']))
+        for info, row in iter_label_rows(label_csv, infos):
+            set_labels(info, row)
 
-                    if 'is_wrong_in_by_fp' in row:
-                        match[0].is_wrong_in_by_fp = bool(int(row['is_wrong_in_by_fp']))    
+    return infos, lots
 
-                    if 'is_wrong_in_by_side_lot' in row:
-                        match[0].is_wrong_in_by_side_lot = bool(int(row['is_wrong_in_by_side_lot']))
+def read_label_rows(label_csv: str) -> dict[str, dict]:
+    """ラベルcsvを json列 -> 行 の辞書で返す（読み込みながらラベルを設定する場合に使う）"""
+    if not os.path.exists(label_csv):
+        return {}
+
+    with open(label_csv, newline='', encoding='utf-8-sig') as f:
+        return {row['json']: row for row in csv.DictReader(f)}
+
+def iter_label_rows(label_csv: str, infos: list[ParkingInfo]):
+    """ラベルcsvを1行ずつ読み、json列に対応する ParkingInfo と組にして返す
+
+    一致しない行（または複数のデータに一致する行）は読み飛ばし、最後にまとめて件数を表示する。
+    """
+    index: dict[str, ParkingInfo] = {}
+    duplicated = set()
+    for info in infos:
+        if info.json_file in index:
+            duplicated.add(info.json_file)
+        index[info.json_file] = info
+
+    unmatched = []
+    with open(label_csv, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            json_file = row['json']
+            info = index.get(json_file)
+            if info is None or json_file in duplicated:
+                unmatched.append(json_file)
+                continue
 
-                    if 'is_first' in row:
-                        match[0].is_first = bool(int(row['is_first']))
+            yield info, row
 
-                    if 'status' in row:
-                        match[0].status = Status(int(row['status']))
-                else:
-                    print(row['json'])
-
-    return infos, lots
+    if unmatched:
+        examples = ', '.join(unmatched[:5]) + (', ...' if len(unmatched) > 5 else '')
+        print(f'[{os.path.basename(label_csv)}] Unmatched rows: {len(unmatched)} ({examples})')
 
 def save_label(path: str, infos: list[ParkingInfo]):
     path = os.path.join(path, 'label.csv')
@@ -186,194 +340,202 @@ def save_label(path: str, infos: list[ParkingInfo]):
                     ])
     return path
 
-def eval(lots, infos: list[ParkingInfo]):
-    detect_all = []
-    detect_ok = []
-
-    ng_out = []
-    ng_shadow = []
-    ng_occlusion = []
-    ng_fp = []
-    ng_blur = []
-    ng_overexposure = []
-    ng_ai = []
-    ng_others = []
-
-    wrong_out = []
-
-    is_miss_in = []
-    is_miss_out = []
-    is_gt_unknown = []
-    is_wrong_in_by_fp = []
-    is_wrong_in_by_side_lot = []
-
-    resend = []
-    is_occupied_last = False
-
-    infos_wo_moving = [info for info in infos if info.vehicle_status != 'Moving']
-
-    for lot in lots:
-        for info in infos_wo_moving:
-            if info.lot != lot:
-                continue
+# 全桁NGの内訳（eval_counts のキー -> Status）
+NG_STATUSES = {
+    'ng_out': Status.NG_Out,
+    'ng_shadow': Status.NG_Shadow,
+    'ng_occlusion': Status.NG_Occlusion,
+    'ng_fp': Status.NG_FP,
+    'ng_blur': Status.NG_Blur,
+    'ng_overexposure': Status.NG_OverExposure,
+    'ng_ai': Status.NG_AI,
+    'ng_others': Status.NG_Others,
+}
 
-            if info.status == Status.Wrong_Out:
-                wrong_out.append(info)
-
-            if info.is_miss_in:
-                is_miss_in.append(info)
-            if info.is_miss_out:
-                is_miss_out.append(info)
-            if info.is_wrong_in_by_fp:
-                is_wrong_in_by_fp.append(info)
-            if info.is_wrong_in_by_side_lot:
-                is_wrong_in_by_side_lot.append(info)    
-            
-            
-            if info.is_occupied:
-                detect_all.append(info)
-
-                if is_occupied_last:
-                    resend.append(info)
-
-                if info.is_gt_unknown:
-                    is_gt_unknown.append(info)
-
-                if info.status == Status.OK:
-                    detect_ok.append(info)
-                elif info.status == Status.NG_Out:
-                    ng_out.append(info)
-                elif info.status == Status.NG_Shadow:
-                    ng_shadow.append(info)
-                elif info.status == Status.NG_Occlusion:
-                    ng_occlusion.append(info)
-                elif info.status == Status.NG_FP:
-                    ng_fp.append(info)  
-                elif info.status == Status.NG_Blur:
-                    ng_blur.append(info)
-                elif info.status == Status.NG_OverExposure:
-                    ng_overexposure.append(info)
-                elif info.status == Status.NG_AI:
-                    ng_ai.append(info)
-                elif info.status == Status.NG_Others:
-                    ng_others.append(info)
-                else:
-                    print('Unknown status:', info.lot, info.timestamp)
-            
-            is_occupied_last = info.is_occupied
-
-            # if info.status == Status.NoLabel:
-            #     print('No label data exists.')
-
-    detect_all_f = [info for info in detect_all if info.is_first == True]
-    detect_ok_f = [info for info in detect_ok if info.is_first == True]
-    wrong_out_f = [info for info in wrong_out if info.is_first == True]
-
-    ng_out_f = [info for info in ng_out if info.is_first == True]
-    ng_shadow_f = [info for info in ng_shadow if info.is_first == True]
-    ng_occlusion_f = [info for info in ng_occlusion if info.is_first == True]
-    ng_fp_f = [info for info in ng_fp if info.is_first == True]
-    ng_blur_f = [info for info in ng_blur if info.is_first == True]
-    ng_overexposure_f = [info for info in ng_overexposure if info.is_first == True]
-    ng_ai_f = [info for info in ng_ai if info.is_first == True]
-    ng_others_f = [info for info in ng_others if info.is_first == True]
-
-    ng_all = len(ng_out) + len(ng_shadow) + len(ng_occlusion) + len(ng_fp) + len(ng_blur) + len(ng_overexposure) + len(ng_ai) + len(ng_others)
-    ng_all_f = len(ng_out_f) + len(ng_shadow_f) + len(ng_occlusion_f) + len(ng_fp_f) + len(ng_blur_f) + len(ng_overexposure_f) + len(ng_ai_f) + len(ng_others_f)
+# 初回（is_first）で絞った件数も数える項目
+FIRST_COUNTS = ('detect_all', 'detect_ok', 'wrong_out') + tuple(NG_STATUSES)
+
+# 件数のみ数える項目
+FLAG_COUNTS = ('is_miss_in', 'is_miss_out', 'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot', 'is_gt_unknown', 'resend')
+
+def eval_counts(lots, infos: list[ParkingInfo], report_unknown: bool = True):
+    """eval の集計に必要な件数を列の配列から一括で数える
+
+    lotsの順に、各lotのMoving以外のレコードを infos の順に並べた列を評価対象とする。
+    再送回数は、この並びで1つ前のレコードも Is_Occupied だった件数（lotの境界もまたぐ）。
+    """
+    counts = {name: 0 for name in FIRST_COUNTS + tuple(name + '_f' for name in FIRST_COUNTS) + FLAG_COUNTS}
+    if len(infos) == 0:
+        return counts
+
+    store = infos[0].store
+    columns = store.columns
+    if infos is store.views():
+        index = slice(None)
+    else:
+        index = np.fromiter((info.index for info in infos), dtype=np.int64, count=len(infos))
+
+    # lotsの並び順（lotsに無いlotは -1）
+    lot_rank = np.full(len(store.strings), -1, dtype=np.int64)
+    for rank, lot in enumerate(lots):
+        if lot in store.string_ids:
+            lot_rank[store.string_ids[lot]] = rank
+    rank = lot_rank[columns['lot'][index]]
+
+    target = rank >= 0
+    moving_id = store.string_ids.get('Moving')
+    if moving_id is not None:
+        target &= columns['vehicle_status'][index] != moving_id
+
+    # lotごとに infos の順で並べる
+    positions = np.flatnonzero(target)
+    positions = positions[np.argsort(rank[positions], kind='stable')]
+    if not isinstance(index, slice):
+        positions = index[positions]
+
+    status = columns['status'][positions]
+    is_first = columns['is_first'][positions]
+    is_occupied = columns['is_occupied'][positions] == 1
+
+    def count(mask):
+        return int(np.count_nonzero(mask))
+
+    wrong_out = status == Status.Wrong_Out.value
+    counts['wrong_out'] = count(wrong_out)
+    counts['wrong_out_f'] = count(wrong_out & is_first)
+
+    for name in ('is_miss_in', 'is_miss_out', 'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot'):
+        counts[name] = count(columns[name][positions])
+
+    counts['detect_all'] = count(is_occupied)
+    counts['detect_all_f'] = count(is_occupied & is_first)
+    counts['resend'] = count(is_occupied[1:] & is_occupied[:-1])
+    counts['is_gt_unknown'] = count(is_occupied & columns['is_gt_unknown'][positions])
+
+    ok = is_occupied & (status == Status.OK.value)
+    counts['detect_ok'] = count(ok)
+    counts['detect_ok_f'] = count(ok & is_first)
+
+    known = ok
+    for name, ng_status in NG_STATUSES.items():
+        ng = is_occupied & (status == ng_status.value)
+        counts[name] = count(ng)
+        counts[name + '_f'] = count(ng & is_first)
+        known = known | ng
+
+    if report_unknown:
+        for position in positions[is_occupied & ~known]:
+            info = store.views()[position]
+            print('Unknown status:', info.lot, info.timestamp)
+
+    return counts
+
+def eval_results(counts: dict[str, int]):
+    """eval_counts の件数から評価結果（項目 -> (meta, first)）を作る"""
+    c = counts
+
+    ng_all = sum(c[name] for name in NG_STATUSES)
+    ng_all_f = sum(c[name + '_f'] for name in NG_STATUSES)
+
+    vehicle_all = c['detect_all'] - c['wrong_out'] - c['ng_fp'] - c['resend'] + c['is_miss_out'] + c['is_miss_in']
 
     return {
         '検知総数': (
-            len(detect_all),
-            len(detect_all)
+            c['detect_all'],
+            c['detect_all']
         ),
         '車両総数': (
-            len(detect_all) - len(wrong_out) - len(ng_fp) - len(resend) + len(is_miss_out) + len(is_miss_in),
-            len(detect_all) - len(wrong_out) - len(ng_fp) - len(resend) + len(is_miss_out) + len(is_miss_in),
+            vehicle_all,
+            vehicle_all,
         ),
         '入庫見逃し': (
-            len(is_miss_in),
-            len(is_miss_in),
+            c['is_miss_in'],
+            c['is_miss_in'],
         ),
         '出庫見逃し': (
-            len(is_miss_out),
-            len(is_miss_out),
+            c['is_miss_out'],
+            c['is_miss_out'],
         ),
         '誤入庫（FP）': (
-            len(is_wrong_in_by_fp),
-            len(is_wrong_in_by_fp),
+            c['is_wrong_in_by_fp'],
+            c['is_wrong_in_by_fp'],
         ),
         '誤入庫（隣接区画）': (
-            len(is_wrong_in_by_side_lot),
-            len(is_wrong_in_by_side_lot),
+            c['is_wrong_in_by_side_lot'],
+            c['is_wrong_in_by_side_lot'],
         ),
         '誤出庫': (
-            len(wrong_out),
-            len(wrong_out_f),
+            c['wrong_out'],
+            c['wrong_out_f'],
         ),
         '全桁OK': (
-            len(detect_ok),
-            len(detect_ok_f),
+            c['detect_ok'],
+            c['detect_ok_f'],
         ),
         '全桁NG': (
             ng_all,
             ng_all_f,
         ),
         '全桁NG（見切れ）': (
-            len(ng_out),
-            len(ng_out_f),
+            c['ng_out'],
+            c['ng_out_f'],
         ),
         '全桁NG（影）': (
-            len(ng_shadow),
-            len(ng_shadow_f),
+            c['ng_shadow'],
+            c['ng_shadow_f'],
         ),
         '全桁NG（Occlusion）': (
-            len(ng_occlusion),
-            len(ng_occlusion_f),
+            c['ng_occlusion'],
+            c['ng_occlusion_f'],
         ),
         '全桁NG（FP）': (
-            len(ng_fp),
-            len(ng_fp_f),
+            c['ng_fp'],
+            c['ng_fp_f'],
         ),
         '全桁NG（Blur）': (
-            len(ng_blur),
-            len(ng_blur_f),
+            c['ng_blur'],
+            c['ng_blur_f'],
         ),
         '全桁NG（白飛び）': (
-            len(ng_overexposure),
-            len(ng_overexposure_f),
+            c['ng_overexposure'],
+            c['ng_overexposure_f'],
         ),
         '全桁NG（AIモデル）': (
-            len(ng_ai),
-            len(ng_ai_f),
+            c['ng_ai'],
+            c['ng_ai_f'],
         ),
         '全桁NG（その他）': (
-            len(ng_others),
-            len(ng_others_f),
+            c['ng_others'],
+            c['ng_others_f'],
         ),
         'GT不明': (
-            len(is_gt_unknown),
-            len(is_gt_unknown)
+            c['is_gt_unknown'],
+            c['is_gt_unknown']
         ),
         '再送回数': (
-            len(resend),
-            len(resend)
+            c['resend'],
+            c['resend']
         ),
         '全桁精度（メタごと）': (
-            len(detect_ok) / len(detect_all),
-            len(detect_ok_f) / len(detect_all_f) if len(detect_all_f) > 0 else 0
+            c['detect_ok'] / c['detect_all'],
+            c['detect_ok_f'] / c['detect_all_f'] if c['detect_all_f'] > 0 else 0
         ),
         '全桁精度（車両ごと）': (
             '-',
-            len(detect_ok_f) / (len(detect_ok_f) + ng_all_f + len(is_miss_in) + len(is_wrong_in_by_fp) + len(is_wrong_in_by_side_lot))
+            c['detect_ok_f'] / (c['detect_ok_f'] + ng_all_f + c['is_miss_in'] + c['is_wrong_in_by_fp'] + c['is_wrong_in_by_side_lot'])
         ),
         '全桁精度（見切れ/FP抜き）': (
-            len(detect_ok) / (len(detect_all) - len(ng_fp) - len(ng_out)),
-            len(detect_ok_f) / (len(detect_all_f) - len(ng_fp_f) - len(ng_out_f)) if (len(detect_all_f) - len(ng_fp_f) - len(ng_out_f)) > 0 else 0
+            c['detect_ok'] / (c['detect_all'] - c['ng_fp'] - c['ng_out']),
+            c['detect_ok_f'] / (c['detect_all_f'] - c['ng_fp_f'] - c['ng_out_f']) if (c['detect_all_f'] - c['ng_fp_f'] - c['ng_out_f']) > 0 else 0
         )
 }
 
-def save_eval(path: str, lots, infos: list[ParkingInfo]):        
-    eval_results = eval(lots, infos)
+def eval(lots, infos: list[ParkingInfo]):
+    return eval_results(eval_counts(lots, infos))
+
+def save_eval(path: str, lots, infos: list[ParkingInfo], eval_results: dict = None):
+    if eval_results is None:
+        eval_results = eval(lots, infos)
 
     path = os.path.join(path, 'eval.csv')
     with open(path, 'w', newline='', encoding='utf-8-sig') as f:
@@ -0,0 +1,121 @@
+import numpy as np
+
+from app.models.parking_info import ParkingInfo
+from app.controllers.data_manager import NG_STATUSES, eval_counts, eval_results
+from app.types import Status
+
+
+class EvalAccumulator:
+    """ラベルの変更ごとに eval の件数を差分で更新する
+
+    RecordStore の変更通知を受け、変更されたレコードの寄与だけを件数から引いて足し直す。
+    Is_Occupied / Vehicle_Status / lot はラベル編集で変わらないため、評価対象と再送回数は初回の集計のまま。
+    self_check=True の場合、results() のたびに eval を全件で再計算して一致を確認する。
+    集計できないステータス（Unknown status）は、作成時に全件を、以降はステータスを変更したレコードを表示する。
+    """
+
+    def __init__(self, lots, infos: list[ParkingInfo], self_check: bool = False):
+        self.lots = lots
+        self.infos = infos
+        self.self_check = self_check
+
+        self.counts = eval_counts(lots, infos)
+
+        self.store = infos[0].store if len(infos) > 0 else None
+        if self.store is None:
+            return
+
+        # 評価対象（lotsに含まれるlotで、Moving以外）
+        lot_ids = [self.store.string_ids[lot] for lot in lots if lot in self.store.string_ids]
+        self.target = np.zeros(len(self.store), dtype=bool)
+        index = np.fromiter((info.index for info in infos), dtype=np.int64, count=len(infos))
+        self.target[index] = np.isin(self.store.columns['lot'][index], lot_ids)
+
+        moving_id = self.store.string_ids.get('Moving')
+        if moving_id is not None:
+            self.target &= self.store.columns['vehicle_status'] != moving_id
+
+        self.store.listeners.append(self.on_changed)
+
+    def close(self):
+        if self.store is not None and self.on_changed in self.store.listeners:
+            self.store.listeners.remove(self.on_changed)
+
+    def on_changed(self, name: str, index: int, old):
+        if name not in ParkingInfo.LABELS or name == 'stop_info':
+            return
+        if index >= len(self.target) or not self.target[index]:
+            return
+
+        # 変更前の値での寄与を引き、現在の値での寄与を足す
+        self.add(index, -1, {name: old})
+        self.add(index, 1)
+
+        if name == 'status':
+            self.report_unknown(index)
+
+    def report_unknown(self, index: int):
+        """Is_Occupied のレコードのステータスが OK / NG 以外であれば表示する（eval では数えられない）"""
+        columns = self.store.columns
+        if columns['is_occupied'][index] != 1:
+            return
+
+        status = columns['status'][index]
+        if status != Status.OK.value and all(status != ng_status.value for ng_status in NG_STATUSES.values()):
+            info = self.store.views()[index]
+            print('Unknown status:', info.lot, info.timestamp)
+
+    def add(self, index: int, sign: int, override: dict = None):
+        columns = self.store.columns
+
+        def value(name):
+            if override is not None and name in override:
+                return override[name]
+            return columns[name][index]
+
+        counts = self.counts
+        status = value('status')
+        is_first = bool(value('is_first'))
+
+        if status == Status.Wrong_Out.value:
+            counts['wrong_out'] += sign
+            if is_first:
+                counts['wrong_out_f'] += sign
+
+        for name in ('is_miss_in', 'is_miss_out', 'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot'):
+            if value(name):
+                counts[name] += sign
+
+        if columns['is_occupied'][index] != 1:
+            return
+
+        # detect_all と再送回数は Is_Occupied のみで決まるため変わらない
+        if is_first:
+            counts['detect_all_f'] += sign
+
+        if value('is_gt_unknown'):
+            counts['is_gt_unknown'] += sign
+
+        if status == Status.OK.value:
+            counts['detect_ok'] += sign
+            if is_first:
+                counts['detect_ok_f'] += sign
+
+        for name, ng_status in NG_STATUSES.items():
+            if status == ng_status.value:
+                counts[name] += sign
+                if is_first:
+                    counts[name + '_f'] += sign
+
+    def results(self):
+        results = eval_results(self.counts)
+
+        if self.self_check:
+            expected = eval_results(eval_counts(self.lots, self.infos, report_unknown=False))
+            mismatch = [k for k in expected if expected[k] != results[k]]
+            if mismatch:
+                print('[eval] Incremental result mismatch:', ', '.join(mismatch))
+                self.counts = eval_counts(self.lots, self.infos, report_unknown=False)
+                return expected
+
+        return results
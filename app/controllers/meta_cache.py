@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+
+from app.models.parking_info import ParkingInfo
+from app.models.record_store import RecordStore
+
+CACHE_DIR = '.park_eval_cache'
+CACHE_FILE = 'meta_cache.npz'
+CACHE_VERSION = 2
+
+NAMES = ('lot', 'is_ps') + ParkingInfo.FIELDS
+
+
+def decode_column(kind: str, values: np.ndarray, strings: list, int_mask: np.ndarray = None) -> list:
+    """RecordStore の列の配列を ParkingInfo.extract 形式の値のリストに戻す"""
+    if kind == 'str':
+        return [strings[value] for value in values.tolist()]
+    if kind == 'float':
+        return [None if value != value else (int(value) if is_int else value) for value, is_int in zip(values.tolist(), int_mask.tolist())]
+    if kind == 'bool3':
+        return [None if value < 0 else bool(value) for value in values.tolist()]
+    return values.tolist()
+
+
+class MetaCache:
+    """META jsonの抽出結果をデータフォルダ内にキャッシュする
+
+    ファイル名・サイズ・mtimeが一致するjsonは再パースせずにキャッシュから復元する。
+    保存形式は RecordStore の列の配列と文字列プールを np.savez_compressed したもの（読み込み時に pickle は使わない）。
+    """
+
+    def __init__(self, path: str, roi: tuple = (0, 0, 0, 0)):
+        self.cache_path = os.path.join(path, CACHE_DIR, CACHE_FILE)
+        self.roi = tuple(roi)
+
+        # json_file -> (size, mtime_ns, row)
+        self.entries: dict[str, tuple] = {}
+        self.columns: dict[str, list] = {}
+
+    def read(self):
+        if not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if int(data['version']) != CACHE_VERSION or tuple(data['fields'].tolist()) != ParkingInfo.FIELDS or tuple(data['roi'].tolist()) != self.roi:
+                    return
+
+                kinds = {name: column.kind for name, column in ParkingInfo.columns().items()}
+                strings = [None] + data['strings'].tolist()
+                columns = {'found': data['found'].tolist()}
+                for name in NAMES:
+                    int_mask = data['int_mask_' + name] if kinds[name] == 'float' else None
+                    columns[name] = decode_column(kinds[name], data['column_' + name], strings, int_mask)
+                stats = zip(data['files'].tolist(), data['sizes'].tolist(), data['mtimes'].tolist())
+        except Exception as e:
+            print('[meta cache] Failed to read:', e)
+            return
+
+        self.columns = columns
+        for row, (json_file, size, mtime) in enumerate(stats):
+            self.entries[json_file] = (size, mtime, row)
+
+    def record(self, row: int):
+        if not self.columns['found'][row]:
+            return None
+        return {name: self.columns[name][row] for name in NAMES}
+
+    def get(self, json_file: str, size: int, mtime: int):
+        """キャッシュヒット時は (True, ParkingInfo.extract 形式の行 または None) を返す"""
+        entry = self.entries.get(json_file)
+        if entry is None or entry[0] != size or entry[1] != mtime:
+            return False, None
+
+        record = self.record(entry[2])
+        if record is not None:
+            record['json_file'] = json_file
+        return True, record
+
+    def write(self, stats: list[tuple], rows: list, keep: set[str] = None):
+        """stats: (json_file, size, mtime_ns) のリスト、rows: 対応する ParkingInfo.extract の結果（またはNone）
+
+        keep に含まれるファイルのうち stats に無いものは、読み込み済みのキャッシュから引き継ぐ。
+        """
+        stats = list(stats)
+        rows = list(rows)
+        if keep:
+            visited = {stat[0] for stat in stats}
+            for json_file, (size, mtime, row) in self.entries.items():
+                if json_file in keep and json_file not in visited:
+                    stats.append((json_file, size, mtime))
+                    rows.append(self.record(row))
+
+        # 列の格納形式は RecordStore に合わせる（見つからなかったjsonは found = False の空行）
+        store = RecordStore()
+        store.extend([{name: row[name] for name in NAMES} if row is not None else {} for row in rows])
+
+        arrays = {
+            'version': np.array(CACHE_VERSION),
+            'fields': np.array(ParkingInfo.FIELDS),
+            'roi': np.array(self.roi),
+            'files': np.array([stat[0] for stat in stats], dtype=str),
+            'sizes': np.array([stat[1] for stat in stats], dtype=np.int64),
+            'mtimes': np.array([stat[2] for stat in stats], dtype=np.int64),
+            'found': np.array([row is not None for row in rows], dtype=bool),
+            'strings': np.array([str(value) for value in store.strings[1:]], dtype=str),
+        }
+        for name in NAMES:
+            arrays['column_' + name] = store.columns[name]
+            if name in store.int_masks:
+                arrays['int_mask_' + name] = store.int_masks[name]
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print('[meta cache] Failed to write:', e)
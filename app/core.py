@@ -0,0 +1,15 @@
+"""Qt に依存しないデータ/評価層の入口
+
+バッチ処理やスクリプトからはここを import する（PyQt6 は読み込まない）。
+Qt のキー割り当ては app/views/key_bindings.py にある。
+"""
+from app.types import Status, text_for
+from app.models.parking_info import ParkingInfo
+from app.models.record_store import RecordStore
+from app.controllers.data_manager import load, eval, eval_counts, eval_results, save_label, save_eval
+
+__all__ = [
+    'Status', 'text_for',
+    'ParkingInfo', 'RecordStore',
+    'load', 'eval', 'eval_counts', 'eval_results', 'save_label', 'save_eval',
+]
@@ -0,0 +1,69 @@
+import os
+
+# フレームごとの画像（フォルダ名, ファイル名の末尾）
+ASSETS = (
+    ('IT', '_plate.bmp'),
+    ('IT', '_vehicle.jpg'),
+    ('RAW', '_raw.jpg'),
+    # ebsim の画像（ファイル名は TimeStamp）
+    ('isp', '.png'),
+)
+
+# 無いデータフォルダもあるフォルダ（フォルダごと無い場合は報告しない）
+OPTIONAL_DIRS = ('isp',)
+
+
+def asset_name(frame: tuple[str, str], dir_name: str, suffix: str) -> str:
+    """フレーム（TimeStamp, ParkingInfo.name()）の画像のファイル名"""
+    timestamp, name = frame
+    return f'{timestamp if dir_name == "isp" else name}{suffix}'
+
+
+class AssetIndex:
+    """データフォルダの IT/ と RAW/（ebsim の場合は isp/）のファイル名の一覧（読み込み時に1回だけ os.scandir する）
+
+    画像の有無をファイルごとの os.path.exists の代わりにメモリ上で判定する。
+    読み込み後に追加されたファイルは、フォルダを読み込み直すまで反映されない。
+    ネットワーク越しのフォルダでは一覧の取得に時間がかかるため、GUI では LoadWorker のスレッドで作る。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dirs: dict[str, set[str]] = {}
+        # 見つからなかったフォルダ
+        self.absent: set[str] = set()
+        for dir_name in dict.fromkeys(dir_name for dir_name, _ in ASSETS):
+            image_dir = os.path.normpath(os.path.join(path, dir_name))
+            try:
+                self.dirs[image_dir] = {entry.name for entry in os.scandir(image_dir) if entry.is_file()}
+            except OSError:
+                self.dirs[image_dir] = set()
+                self.absent.add(dir_name)
+
+    def exists(self, path: str) -> bool:
+        """索引したフォルダのファイルは一覧から、それ以外は os.path.exists で判定する"""
+        names = self.dirs.get(os.path.dirname(os.path.normpath(path)))
+        if names is None:
+            return os.path.exists(path)
+        return os.path.basename(path) in names
+
+    def missing(self, frames: list[tuple[str, str]]) -> dict[tuple, list]:
+        """画像が無いフレーム（TimeStamp, ParkingInfo.name()）を、画像の種類（フォルダ名, ファイル名の末尾）ごとに返す"""
+        result = {}
+        for dir_name, suffix in ASSETS:
+            if dir_name in OPTIONAL_DIRS and dir_name in self.absent:
+                continue
+            names = self.dirs[os.path.normpath(os.path.join(self.path, dir_name))]
+            result[dir_name, suffix] = [frame for frame in frames if asset_name(frame, dir_name, suffix) not in names]
+        return result
+
+    def report(self, frames: list[tuple[str, str]], limit: int = 5):
+        """画像が無いフレームの数と、先頭の limit 件の名前を表示する"""
+        missing = self.missing(frames)
+        labels = {asset: asset[1][1:] if asset[0] not in OPTIONAL_DIRS else f'{asset[0]}/*{asset[1]}' for asset in missing}
+        print('[assets] Missing: ' + ', '.join(f'{labels[asset]}: {len(frames)}' for asset, frames in missing.items()) + f' / {len(frames)} frames')
+        for (dir_name, suffix), missing_frames in missing.items():
+            for frame in missing_frames[:limit]:
+                print(f'[assets]   {asset_name(frame, dir_name, suffix)}')
+            if len(missing_frames) > limit:
+                print(f'[assets]   ... and {len(missing_frames) - limit} more {suffix}')
@@ -0,0 +1,89 @@
+import numpy as np
+
+from app.models.plate_index import PlateIndex
+from app.types import Status
+
+
+class FilterIndex:
+    """フィルタ条件ごとに、一致するレコードのマスク（bool配列）を保持する
+
+    lot / Vehicle_Status / status ごとのマスクと、is_move_y_ng の判定結果のマスクを持つ。
+    ラベルのフラグ（is_gt_unknown など）と読み込み時に計算した判定（conf_ng など）は RecordStore の列そのものをマスクとして使う。
+    ラベルが変更されると、RecordStore の変更通知で該当レコードのマスクだけを更新する。
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+        self.lots: dict[int, np.ndarray] = {}
+        self.vehicle_statuses: dict[int, np.ndarray] = {}
+        self.statuses: dict[Status, np.ndarray] = {}
+        self.predicates: dict[str, np.ndarray] = {}
+        self.plates: PlateIndex = None
+
+        self.build()
+        store.listeners.append(self.on_changed)
+
+    def close(self):
+        if self.on_changed in self.store.listeners:
+            self.store.listeners.remove(self.on_changed)
+
+    def build(self):
+        columns = self.store.columns
+
+        self.lots = {int(lot_id): columns['lot'] == lot_id for lot_id in np.unique(columns['lot'])}
+        self.vehicle_statuses = {int(value_id): columns['vehicle_status'] == value_id for value_id in np.unique(columns['vehicle_status'])}
+        self.statuses = {status: columns['status'] == status.value for status in Status}
+
+        # status / stop_info に依存するため、ラベル変更時に更新する
+        self.predicates['move_y_ng'] = self.move_y_ng(slice(None))
+
+        self.plates = PlateIndex(self.store)
+
+    def move_y_ng(self, index):
+        """is_move_y_ng（threshold=0）を列から判定する"""
+        columns = self.store.columns
+        stop_info = columns['stop_info'][index]
+        end_y = columns['move_plate_end_y'][index]
+
+        has_stop = stop_info >= 0
+        stop_end_y = columns['move_plate_end_y'][np.where(has_stop, stop_info, 0)]
+
+        # None（NaN）を含む差は比較で常に False
+        diff_y = end_y - stop_end_y
+        return (columns['status'][index] == Status.MovingOut.value) & has_stop & (diff_y > 0)
+
+    def on_changed(self, name: str, index: int, old):
+        if name == 'status':
+            self.statuses[Status(int(old))][index] = False
+            self.statuses[Status(int(self.store.columns['status'][index]))][index] = True
+
+        if name in ('status', 'stop_info'):
+            self.predicates['move_y_ng'][index] = self.move_y_ng(np.array([index]))[0]
+
+    def empty(self) -> np.ndarray:
+        return np.zeros(len(self.store), dtype=bool)
+
+    def all(self) -> np.ndarray:
+        return np.ones(len(self.store), dtype=bool)
+
+    def lot(self, lot: str) -> np.ndarray:
+        lot_id = self.store.string_ids.get(lot)
+        return self.lots.get(lot_id, self.empty()) if lot_id is not None else self.empty()
+
+    def vehicle_status(self, value: str) -> np.ndarray:
+        value_id = self.store.string_ids.get(value)
+        return self.vehicle_statuses.get(value_id, self.empty()) if value_id is not None else self.empty()
+
+    def status(self, status: Status) -> np.ndarray:
+        return self.statuses[status]
+
+    def flag(self, name: str) -> np.ndarray:
+        """ラベルのフラグ（is_first など）または判定（conf_ng など）のマスク"""
+        if name in self.predicates:
+            return self.predicates[name]
+        return self.store.columns[name]
+
+    def plate(self, text: str, max_distance: int = 0) -> np.ndarray:
+        """ナンバープレートの文字列に text を含む（max_distance 以内の編集を許す）レコードのマスク"""
+        return self.plates.mask(text, max_distance)
@@ -0,0 +1,271 @@
+import re
+
+import numpy as np
+
+from app.models.parking_info import ParkingInfo
+from app.types import Status
+
+
+class QueryError(ValueError):
+    pass
+
+
+# 例: lot=="00" and status in (NG_Blur, NG_Shadow) and plate_confidence<0.4 and top_format_ng
+TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>==|!=|<=|>=|<|>|~|\(|\)|,)
+      | (?P<name>[A-Za-z_]\w*)
+    )''', re.VERBOSE)
+
+KEYWORDS = ('and', 'or', 'not', 'in')
+CONSTANTS = {'None': None, 'True': True, 'False': False}
+
+# FilterIndex の判定（is_conf_ng など）
+PREDICATES = ('conf_ng', 'top_format_ng', 'bottom_format_ng', 'move_y_ng')
+
+# ナンバープレートの文字列検索（plate == "品川" は部分一致、plate ~ "品川" は編集1回まで許す）
+PLATE = 'plate'
+PLATE_DISTANCE = 1
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise QueryError(f'Invalid character at {position}: {text[position:position + 10]!r}')
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class FilterQuery:
+    """レコードの列に対する条件式を、FilterIndex のマスクを返す関数にコンパイルする
+
+    書式:
+        式     := 項 ('or' 項)*
+        項     := 否定 ('and' 否定)*
+        否定   := 'not' 否定 | '(' 式 ')' | 比較 | 名前
+        比較   := 列 (== | != | < | <= | > | >=) 値 | 列 ['not'] 'in' '(' 値, ... ')' | plate (== | ~) "文字列"
+        値     := 数値 | "文字列" | None | True | False | Status名（NG_Blur など）
+
+    名前だけの条件はbool列（is_first など）または判定（conf_ng / top_format_ng / bottom_format_ng / move_y_ng）。
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.position = 0
+
+        self.evaluate = self.parse_or()
+        if self.position < len(self.tokens):
+            raise QueryError(f'Unexpected token: {self.tokens[self.position][1]}')
+
+    def __call__(self, masks) -> np.ndarray:
+        return self.evaluate(masks)
+
+    # --- parser ---
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, value: str = None):
+        kind, token = self.peek()
+        if kind is None:
+            raise QueryError('Unexpected end of query')
+        if value is not None and token != value:
+            raise QueryError(f'Expected {value}, got {token}')
+        self.position += 1
+        return kind, token
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek() == ('name', 'or'):
+            self.take()
+            terms.append(self.parse_and())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda masks: np.logical_or.reduce([term(masks) for term in terms])
+
+    def parse_and(self):
+        terms = [self.parse_not()]
+        while self.peek() == ('name', 'and'):
+            self.take()
+            terms.append(self.parse_not())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda masks: np.logical_and.reduce([term(masks) for term in terms])
+
+    def parse_not(self):
+        kind, token = self.peek()
+        if (kind, token) == ('name', 'not'):
+            self.take()
+            term = self.parse_not()
+            return lambda masks: ~term(masks)
+
+        if (kind, token) == ('op', '('):
+            self.take()
+            term = self.parse_or()
+            self.take(')')
+            return term
+
+        if kind != 'name' or token in KEYWORDS:
+            raise QueryError(f'Expected a field name, got {token}')
+        self.take()
+        field = token
+
+        kind, token = self.peek()
+        if field == PLATE:
+            if kind != 'op' or token not in ('==', '~'):
+                raise QueryError('plate needs == or ~ and a string')
+            self.take()
+            kind, text = self.take()
+            if kind != 'string':
+                raise QueryError('plate needs == or ~ and a string')
+            max_distance = PLATE_DISTANCE if token == '~' else 0
+            return lambda masks: masks.plate(text[1:-1], max_distance)
+
+        if kind == 'op' and token in ('==', '!=', '<', '<=', '>', '>='):
+            self.take()
+            return compare(field, token, self.parse_value(field))
+
+        if (kind, token) == ('name', 'in') or (kind, token) == ('name', 'not'):
+            negate = token == 'not'
+            if negate:
+                self.take()
+            self.take('in')
+            values = self.parse_values(field)
+            term = compare_in(field, values)
+            return (lambda masks: ~term(masks)) if negate else term
+
+        return flag(field)
+
+    def parse_values(self, field: str) -> list:
+        self.take('(')
+        values = [self.parse_value(field)]
+        while self.peek() == ('op', ','):
+            self.take()
+            values.append(self.parse_value(field))
+        self.take(')')
+        return values
+
+    def parse_value(self, field: str):
+        kind, token = self.take()
+        if kind == 'number':
+            # 文字列の列（lot など）は数値を書いたとおりの文字列として比較する（lot==00 は "00"）
+            if field not in PREDICATES and column_kind(field) == 'str':
+                return token
+            return float(token) if any(c in token for c in '.eE') else int(token)
+        if kind == 'string':
+            return token[1:-1]
+        if kind == 'name' and token in CONSTANTS:
+            return CONSTANTS[token]
+        if kind == 'name' and field == 'status':
+            if token not in Status.__members__:
+                raise QueryError(f'Unknown status: {token}')
+            return Status[token]
+        raise QueryError(f'Invalid value for {field}: {token}')
+
+
+def column_kind(field: str) -> str:
+    kinds = {name: column.kind for name, column in ParkingInfo.columns().items()}
+    if field not in kinds:
+        raise QueryError(f'Unknown field: {field}')
+    return kinds[field]
+
+
+def flag(field: str):
+    if field in PREDICATES:
+        return lambda masks: masks.flag(field)
+
+    kind = column_kind(field)
+    if kind == 'bool':
+        return lambda masks: masks.store.columns[field].copy()
+    if kind == 'bool3':
+        return lambda masks: masks.store.columns[field] == 1
+    raise QueryError(f'{field} is not a boolean field')
+
+
+def encode(masks, field: str, kind: str, value):
+    """値を列の格納形式に変換する"""
+    store = masks.store
+    if kind == 'str':
+        if value is not None and not isinstance(value, str):
+            value = str(value)
+        return store.string_ids.get(value, -1)
+    if kind == 'status':
+        return value.value if isinstance(value, Status) else value
+    return store.encode(kind, value)
+
+
+def compare(field: str, op: str, value):
+    if field in PREDICATES:
+        if op not in ('==', '!=') or not isinstance(value, bool):
+            raise QueryError(f'{field} can only be compared with True / False')
+        negate = (op == '==') != value
+        return lambda masks: ~masks.flag(field) if negate else masks.flag(field)
+
+    kind = column_kind(field)
+    ordering = op not in ('==', '!=')
+
+    if ordering and (value is None or kind in ('bool', 'bool3', 'status', 'index')):
+        raise QueryError(f'{field} {op} {value} is not supported')
+    if kind != 'str' and isinstance(value, str):
+        raise QueryError(f'Invalid value for {field}: {value!r}')
+    if kind == 'index':
+        raise QueryError(f'{field} cannot be compared')
+    if kind == 'status' and (value is None or isinstance(value, (bool, float))):
+        raise QueryError(f'Invalid value for {field}: {value}')
+
+    def evaluate(masks):
+        column = masks.store.columns[field]
+
+        if kind == 'str' and ordering:
+            # 文字列の大小比較（timestamp など）は文字列に戻して比較する
+            strings = masks.store.string_column(field)
+            present = column != 0
+            result = np.zeros(len(column), dtype=bool)
+            result[present] = apply(op, strings[present].astype(str), value if isinstance(value, str) else str(value))
+            return result
+
+        if kind == 'float':
+            if value is None:
+                result = np.isnan(column)
+            else:
+                result = apply(op, column, value)
+                if op == '!=':
+                    # None（nan）は値との比較で常に不一致
+                    result &= ~np.isnan(column)
+            return ~result if (value is None and op == '!=') else result
+
+        encoded = encode(masks, field, kind, value)
+        result = apply(op, column, encoded)
+        if kind == 'bool3' and op == '!=' and value is not None:
+            result &= column >= 0
+        return result
+
+    return evaluate
+
+
+def compare_in(field: str, values: list):
+    terms = [compare(field, '==', value) for value in values]
+    return lambda masks: np.logical_or.reduce([term(masks) for term in terms])
+
+
+def apply(op: str, column: np.ndarray, value) -> np.ndarray:
+    if op == '==':
+        return column == value
+    if op == '!=':
+        return column != value
+    if op == '<':
+        return column < value
+    if op == '<=':
+        return column <= value
+    if op == '>':
+        return column > value
+    return column >= value
@@ -1,18 +1,196 @@
 import os
 import json
 import regex
+from collections import OrderedDict
 
 from app.types import Status
 
+# ナンバーの書式（上段: 地名+分類番号、下段: ひらがな+一連番号）
+TOP_FORMAT = regex.compile(r'^((\p{Han}{1,4}|\p{Hiragana}{3}|(\p{Han}|\p{Katakana}){3})([1-8][0-9A-Z]{2}|[0-9]{2}))$')
+BOTTOM_FORMAT = regex.compile(r'^(\p{Hiragana}|[YABEHKMT])([1-9]{1}\d{1}-\d{2}|・[1-9]{1}\d{2}|・{2}[1-9]{1}\d{1}|・{3}[1-9]{1})$')
+
+CONF_NG_THRESHOLD = 0.3
+
+
+class JsonCache:
+    """最近開いたjsonを保持するLRUキャッシュ（JSON Viewer用）"""
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self.items: OrderedDict[str, dict] = OrderedDict()
+
+    def get(self, json_path: str):
+        data = self.items.get(json_path)
+        if data is not None:
+            self.items.move_to_end(json_path)
+            return data
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if self.maxsize > 0:
+            self.items[json_path] = data
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+        return data
+
+
+json_cache = JsonCache()
+
+
+class Column:
+    """RecordStore の1列を ParkingInfo の属性として読み書きするディスクリプタ
+
+    kind ごとの保持形式:
+        str: 文字列プールのID（0 = None）
+        float: float64（None / 数値以外 = NaN、JSONで整数だった値は int として返す）
+        bool3: int8（None = -1）
+        bool: bool
+        status: int8（Status.value）
+        index: int32（別レコードの行番号、None = -1）
+    """
+
+    DTYPES = {
+        'str': 'int32',
+        'float': 'float64',
+        'bool3': 'int8',
+        'bool': 'bool',
+        'status': 'int8',
+        'index': 'int32',
+    }
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, info, owner=None):
+        if info is None:
+            return self
+        return info.store.get(self.name, info.index)
+
+    def __set__(self, info, value):
+        info.store.set(self.name, info.index, value)
+
+
 class ParkingInfo:
-    def __init__(self, info: dict, data: dict, json_path: str, lot: str = "", is_ps: bool = False):
-        self.lot = lot
-        self.is_ps = is_ps
+    """RecordStore の1行を指すビュー（属性は全て RecordStore の列に保持される）"""
+
+    __slots__ = ('store', 'index')
+
+    # JSONから抽出する項目（メタキャッシュに保存される）
+    FIELDS = (
+        'timestamp',
+        'is_occupied', 'is_occlusion', 'is_uncertain', 'vehicle_status',
+        'lpr_top', 'top_quality', 'lpr_bottom', 'bottom_quality',
+        'prefecture', 'prefecture_quality',
+        'classification_number', 'classification_number_quality',
+        'hiragana', 'hiragana_quality',
+        'license_plate_number', 'license_plate_number_quality',
+        'plate_confidence',
+        'plate_xmin', 'plate_ymin', 'plate_xmax', 'plate_ymax', 'plate_width', 'plate_height', 'plate_score',
+        'vehicle_xmin', 'vehicle_ymin', 'vehicle_xmax', 'vehicle_ymax', 'vehicle_wdith', 'vehicle_height', 'vehicle_score',
+        'plate_count', 'vehicle_count',
+        'move_plate_end_y',
+    )
+
+    # ラベル（label.csv に保存される）
+    LABELS = (
+        'status',
+        'is_miss_in', 'is_miss_out', 'is_gt_unknown', 'is_first',
+        'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot',
+        'stop_info',
+    )
+
+    # 読み込み時に計算する判定と、その計算に使う項目
+    DERIVED = ('conf_ng', 'top_format_ng', 'bottom_format_ng')
+    DERIVED_SOURCES = ('vehicle_status', 'plate_confidence', 'lpr_top', 'lpr_bottom')
+
+    lot = Column('str')
+    is_ps = Column('bool')
+    json_file = Column('str')
+
+    timestamp = Column('str')
+    is_occupied = Column('bool3')
+    is_occlusion = Column('bool3')
+    is_uncertain = Column('bool3')
+    vehicle_status = Column('str')
 
-        self.parse_info(info, data, json_path)
+    lpr_top = Column('str')
+    top_quality = Column('float')
+    lpr_bottom = Column('str')
+    bottom_quality = Column('float')
+
+    prefecture = Column('str')
+    prefecture_quality = Column('float')
+    classification_number = Column('str')
+    classification_number_quality = Column('float')
+    hiragana = Column('str')
+    hiragana_quality = Column('float')
+    license_plate_number = Column('str')
+    license_plate_number_quality = Column('float')
+
+    plate_confidence = Column('float')
+
+    plate_xmin = Column('float')
+    plate_ymin = Column('float')
+    plate_xmax = Column('float')
+    plate_ymax = Column('float')
+    plate_width = Column('float')
+    plate_height = Column('float')
+    plate_score = Column('float')
+
+    vehicle_xmin = Column('float')
+    vehicle_ymin = Column('float')
+    vehicle_xmax = Column('float')
+    vehicle_ymax = Column('float')
+    vehicle_wdith = Column('float')
+    vehicle_height = Column('float')
+    vehicle_score = Column('float')
+
+    plate_count = Column('float')
+    vehicle_count = Column('float')
+
+    # For movement eval
+    move_plate_end_y = Column('float')
+    stop_info = Column('index')
+
+    status = Column('status')
+    is_miss_in = Column('bool')
+    is_miss_out = Column('bool')
+    is_gt_unknown = Column('bool')
+    is_first = Column('bool')
+
+    is_wrong_in_by_fp = Column('bool')
+    is_wrong_in_by_side_lot = Column('bool')
+
+    # 読み込み時に計算する判定（RecordStore.derive）
+    conf_ng = Column('bool')
+    top_format_ng = Column('bool')
+    bottom_format_ng = Column('bool')
+
+    def __init__(self, store, index: int):
+        self.store = store
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, ParkingInfo) and self.store is other.store and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    @classmethod
+    def columns(cls):
+        """列名 -> Column の辞書（定義順）"""
+        return {name: value for name, value in vars(cls).items() if isinstance(value, Column)}
 
     @classmethod
-    def create(cls, json_path, min_x=0, min_y=0, max_x=0, max_y=0):
+    def extract(cls, json_path, min_x=0, min_y=0, max_x=0, max_y=0, keep_json: bool = False):
+        """jsonを読み、RecordStore に追加する1行分の辞書を返す（対象が無ければNone）
+
+        keep_json=False の場合、json全体は保持せず抽出した項目だけを返す（JSON Viewerは load_json で読み直す）。
+        """
         split = os.path.splitext(os.path.basename(json_path))[0].split('_')
 
         # For ebsim
@@ -48,7 +226,7 @@ class ParkingInfo:
                         best_score = score
 
                     if parking_gate_info is not None:
-                        return ParkingInfo(parking_gate_info, data, json_path)
+                        return cls.extract_fields(parking_gate_info, data if keep_json else None, json_path, "", False)
                     else:
                         return None
             else:
@@ -56,79 +234,93 @@ class ParkingInfo:
                 for info in parking_lot_info:
                     if info["Lot"] != lot:
                         continue
-                    return ParkingInfo(info, data, json_path, lot, is_ps)
+                    return cls.extract_fields(info, data if keep_json else None, json_path, lot, is_ps)
+
+    @classmethod
+    def extract_fields(cls, info: dict, data: dict, json_path: str, lot: str = "", is_ps: bool = False):
+        row = {
+            'lot': lot,
+            'is_ps': is_ps,
+            'json_file': os.path.basename(json_path),
+            'json_data': data,
+        }
 
-    def parse_info(self, info: dict, data: dict, json_path: str):
-        self.json_data = data
-        self.timestamp = str(info.get("TimeStamp"))
-        self.json_path = json_path
-        self.json_file = os.path.basename(json_path)
+        row['timestamp'] = str(info.get("TimeStamp"))
 
-        self.is_occupied = info.get("Is_Occupied")
-        self.is_occlusion = info.get("Is_Occlusion")
-        self.is_uncertain = info.get("Is_Uncertain")
-        self.vehicle_status = info.get("Vehicle_Status")
+        row['is_occupied'] = info.get("Is_Occupied")
+        row['is_occlusion'] = info.get("Is_Occlusion")
+        row['is_uncertain'] = info.get("Is_Uncertain")
+        row['vehicle_status'] = info.get("Vehicle_Status")
 
         plate_number = info.get("Plate_Number", {})
-        self.lpr_top = plate_number.get("Top")
-        self.top_quality = plate_number.get("Top_Quality")
-        self.lpr_bottom = plate_number.get("Bottom")
-        self.bottom_quality = plate_number.get("Bottom_Quality")
-
-        self.prefecture = plate_number.get("Prefecture")
-        self.prefecture_quality = plate_number.get("Prefecture_Quality")
-        self.classification_number = plate_number.get("ClassificationNumber")
-        self.classification_number_quality = plate_number.get("ClassificationNumber_Quality")
-        self.hiragana = plate_number.get("Hiragana")    
-        self.hiragana_quality = plate_number.get("Hiragana_Quality")
-        self.license_plate_number = plate_number.get("LicensePlateNumber")
-        self.license_plate_number_quality = plate_number.get("LicensePlateNumber_Quality")
-
-        self.plate_confidence = info.get("Plate_Confidence")
+        row['lpr_top'] = plate_number.get("Top")
+        row['top_quality'] = plate_number.get("Top_Quality")
+        row['lpr_bottom'] = plate_number.get("Bottom")
+        row['bottom_quality'] = plate_number.get("Bottom_Quality")
+
+        row['prefecture'] = plate_number.get("Prefecture")
+        row['prefecture_quality'] = plate_number.get("Prefecture_Quality")
+        row['classification_number'] = plate_number.get("ClassificationNumber")
+        row['classification_number_quality'] = plate_number.get("ClassificationNumber_Quality")
+        row['hiragana'] = plate_number.get("Hiragana")
+        row['hiragana_quality'] = plate_number.get("Hiragana_Quality")
+        row['license_plate_number'] = plate_number.get("LicensePlateNumber")
+        row['license_plate_number_quality'] = plate_number.get("LicensePlateNumber_Quality")
+
+        row['plate_confidence'] = info.get("Plate_Confidence")
 
         lpd_bbox = info.get("LPD_Bbox", {})
-        self.plate_xmin = lpd_bbox.get("xmin")
-        self.plate_ymin = lpd_bbox.get("ymin")
-        self.plate_xmax = lpd_bbox.get("xmax")
-        self.plate_ymax = lpd_bbox.get("ymax")
-        self.plate_width = lpd_bbox.get("width")
-        self.plate_height = lpd_bbox.get("height")
-        self.plate_score = lpd_bbox.get("score")
+        row['plate_xmin'] = lpd_bbox.get("xmin")
+        row['plate_ymin'] = lpd_bbox.get("ymin")
+        row['plate_xmax'] = lpd_bbox.get("xmax")
+        row['plate_ymax'] = lpd_bbox.get("ymax")
+        row['plate_width'] = lpd_bbox.get("width")
+        row['plate_height'] = lpd_bbox.get("height")
+        row['plate_score'] = lpd_bbox.get("score")
 
         vehicle_bbox = info.get("Vehicle_Bbox", {})
-        self.vehicle_xmin = vehicle_bbox.get("xmin")
-        self.vehicle_ymin = vehicle_bbox.get("ymin")
-        self.vehicle_xmax = vehicle_bbox.get("xmax")
-        self.vehicle_ymax = vehicle_bbox.get("ymax")
-        self.vehicle_wdith = vehicle_bbox.get("width")
-        self.vehicle_height = vehicle_bbox.get("height")
-        self.vehicle_score = vehicle_bbox.get("score")
+        row['vehicle_xmin'] = vehicle_bbox.get("xmin")
+        row['vehicle_ymin'] = vehicle_bbox.get("ymin")
+        row['vehicle_xmax'] = vehicle_bbox.get("xmax")
+        row['vehicle_ymax'] = vehicle_bbox.get("ymax")
+        row['vehicle_wdith'] = vehicle_bbox.get("width")
+        row['vehicle_height'] = vehicle_bbox.get("height")
+        row['vehicle_score'] = vehicle_bbox.get("score")
 
         duration = info.get("Duration", {})
-        self.plate_count = duration.get("plate_count")
-        self.vehicle_count = duration.get("vehicle_count")
+        row['plate_count'] = duration.get("plate_count")
+        row['vehicle_count'] = duration.get("vehicle_count")
 
         # For movement eval
         movement = info.get("Movement", {})
         plate = movement.get("Plate", {})
         end = plate.get("End", {})
-        self.move_plate_end_y = end.get("y")
-        self.stop_info:ParkingInfo = None
+        row['move_plate_end_y'] = end.get("y")
+
+        return row
 
+    @property
+    def json_path(self):
+        return os.path.join(self.store.meta_dir, self.json_file)
 
-        self.status = Status.NoLabel
-        self.is_miss_in = False
-        self.is_miss_out = False
-        self.is_gt_unknown = False
-        self.is_first = False
+    @property
+    def json_data(self):
+        return self.store.json_data[self.index]
 
-        self.is_wrong_in_by_fp = False
-        self.is_wrong_in_by_side_lot = False
+    def load_json(self):
+        if self.json_data is not None:
+            return self.json_data
 
+        return json_cache.get(self.json_path)
 
     def name(self):
-        name = self.timestamp + '_' + self.lot
-        return name + '_ps' if self.is_ps else name
+        return self.frame_name(self.timestamp, self.lot, self.is_ps)
+
+    @staticmethod
+    def frame_name(timestamp: str, lot: str, is_ps: bool) -> str:
+        """画像のファイル名の先頭（ParkingInfo.extract の行からも使う）"""
+        name = timestamp + '_' + lot
+        return name + '_ps' if is_ps else name
     
     def set(self, status: Status):
         self.status = status
@@ -148,34 +340,20 @@ class ParkingInfo:
     def set_is_first(self, first_park):
         self.is_first = first_park
 
-    def is_conf_ng(self, threshold=0.3):
+    def is_conf_ng(self, threshold=CONF_NG_THRESHOLD):
+        if threshold == CONF_NG_THRESHOLD:
+            return self.conf_ng
+
         if self.plate_confidence is not None and self.vehicle_status == 'Moving' and self.plate_confidence < threshold:
             return True
         return False
     
     def is_top_format_ng(self):
-        if self.vehicle_status == 'Stop':
-            if self.lpr_top is None:
-                return True
-        
-            top_format = '^((\p{Han}{1,4}|\p{Hiragana}{3}|(\p{Han}|\p{Katakana}){3})([1-8][0-9A-Z]{2}|[0-9]{2}))$'
-            top_match = regex.match(top_format, self.lpr_top)
-            if top_match is None:
-                return True
-        return False
+        return self.top_format_ng
     
     def is_bottom_format_ng(self):
-        if self.vehicle_status == 'Stop':         
-            if self.lpr_bottom is None:
-                return True
-            
-            bottom_format = '^(\p{Hiragana}|[YABEHKMT])([1-9]{1}\d{1}-\d{2}|・[1-9]{1}\d{2}|・{2}[1-9]{1}\d{1}|・{3}[1-9]{1})$'
-            bottom_match = regex.match(bottom_format, self.lpr_bottom)
-            if bottom_match is None:
-                return True
-            
-        return False
-    
+        return self.bottom_format_ng
+
     def diff_move_y(self):
         if self.status != Status.MovingOut or self.stop_info is None :
             return None
@@ -0,0 +1,103 @@
+import unicodedata
+
+import numpy as np
+
+
+def normalize(text: str) -> str:
+    """全角/半角をそろえ、空白・区切り文字（・ -）を除く"""
+    text = unicodedata.normalize('NFKC', text)
+    return ''.join(c for c in text if not c.isspace() and c not in '・-')
+
+
+def substring_distance(pattern: str, text: str, limit: int) -> int:
+    """text のいずれかの部分文字列と pattern の編集距離の最小値（limit を超える場合は limit + 1）"""
+    previous = [0] * (len(text) + 1)
+    for i, p in enumerate(pattern, 1):
+        current = [i] + [0] * len(text)
+        for j, t in enumerate(text, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (p != t))
+        previous = current
+        if min(previous) > limit:
+            return limit + 1
+    return min(previous)
+
+
+class PlateIndex:
+    """ナンバープレートの文字列（lpr_top / lpr_bottom / ebsimの各項目）の2-gram索引
+
+    RecordStore で重複を除いた文字列単位で索引を作り、一致した文字列を持つレコード番号を返す。
+    """
+
+    FIELDS = ('lpr_top', 'lpr_bottom', 'prefecture', 'classification_number', 'hiragana', 'license_plate_number')
+    N = 2
+
+    def __init__(self, store):
+        self.store = store
+
+        # 対象の列の (文字列ID, レコード番号) を文字列IDの順に並べる
+        ids = []
+        records = []
+        for name in self.FIELDS:
+            column = store.columns[name]
+            present = np.flatnonzero(column != 0)
+            ids.append(column[present])
+            records.append(present)
+        ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+        records = np.concatenate(records) if records else np.empty(0, dtype=np.int64)
+
+        order = np.argsort(ids, kind='stable')
+        self.sorted_ids = ids[order]
+        self.sorted_records = records[order]
+
+        # 文字列ID -> 正規化した文字列、2-gram -> 文字列IDの集合
+        self.texts: dict[int, str] = {}
+        self.grams: dict[str, set[int]] = {}
+        for string_id in np.unique(self.sorted_ids):
+            string_id = int(string_id)
+            text = normalize(store.strings[string_id])
+            self.texts[string_id] = text
+            for gram in self.ngrams(text):
+                self.grams.setdefault(gram, set()).add(string_id)
+
+    def ngrams(self, text: str) -> set[str]:
+        return {text[i:i + self.N] for i in range(len(text) - self.N + 1)}
+
+    def candidates(self, pattern: str, max_distance: int):
+        """q-gramの共有数で、一致し得る文字列IDに絞り込む"""
+        grams = [pattern[i:i + self.N] for i in range(len(pattern) - self.N + 1)]
+        # 編集1回で壊れる n-gram は最大 N 個
+        threshold = len(grams) - max_distance * self.N
+        if threshold <= 0:
+            return self.texts.keys()
+
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for string_id in self.grams.get(gram, ()):
+                counts[string_id] = counts.get(string_id, 0) + 1
+        return [string_id for string_id, count in counts.items() if count >= threshold]
+
+    def search(self, text: str, max_distance: int = 0) -> np.ndarray:
+        """text を部分文字列として含む（max_distance 以内の編集を許す）レコード番号を昇順で返す"""
+        pattern = normalize(text)
+        if not pattern:
+            return np.empty(0, dtype=np.int64)
+
+        matched = []
+        for string_id in self.candidates(pattern, max_distance):
+            target = self.texts[string_id]
+            if pattern in target or (max_distance > 0 and substring_distance(pattern, target, max_distance) <= max_distance):
+                matched.append(string_id)
+
+        if not matched:
+            return np.empty(0, dtype=np.int64)
+
+        matched = np.asarray(matched, dtype=self.sorted_ids.dtype)
+        start = np.searchsorted(self.sorted_ids, matched, side='left')
+        end = np.searchsorted(self.sorted_ids, matched, side='right')
+        records = np.concatenate([self.sorted_records[s:e] for s, e in zip(start, end)])
+        return np.unique(records)
+
+    def mask(self, text: str, max_distance: int = 0) -> np.ndarray:
+        mask = np.zeros(len(self.store), dtype=bool)
+        mask[self.search(text, max_distance)] = True
+        return mask
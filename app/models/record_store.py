@@ -0,0 +1,204 @@
+import numpy as np
+
+from app.models.parking_info import ParkingInfo, Column, TOP_FORMAT, BOTTOM_FORMAT, CONF_NG_THRESHOLD
+from app.types import Status
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RecordStore:
+    """ParkingInfo の全項目を列ごとの配列（struct of arrays）で保持する
+
+    文字列は重複を除いて strings に保持し、列にはそのIDを格納する。
+    各レコードへは views() が返す ParkingInfo（行ビュー）を通してアクセスする。
+    """
+
+    def __init__(self, meta_dir: str = ''):
+        self.meta_dir = meta_dir
+
+        self.strings: list[str] = [None]
+        self.string_ids: dict[str, int] = {None: 0}
+
+        self.kinds = {name: column.kind for name, column in ParkingInfo.columns().items()}
+
+        # 列の配列（容量は倍々に確保し、columns / int_masks には先頭 len(self) 件のビューを置く）
+        self.capacity = 0
+        self.buffers: dict[str, np.ndarray] = {name: np.empty(0, dtype=Column.DTYPES[kind]) for name, kind in self.kinds.items()}
+        self.mask_buffers: dict[str, np.ndarray] = {name: np.empty(0, dtype=bool) for name, kind in self.kinds.items() if kind == 'float'}
+        self.columns: dict[str, np.ndarray] = dict(self.buffers)
+
+        # float列のうち、JSONで整数だった値（label.csv に元の表記で書き出すため）
+        self.int_masks: dict[str, np.ndarray] = dict(self.mask_buffers)
+
+        # 読み込み時のjson（保持しない場合はNone）
+        self.json_data: list[dict] = []
+
+        self._views: list[ParkingInfo] = []
+
+        # 値の変更通知 listener(name, index, old)（oldは変更前の列の値）
+        self.listeners: list = []
+
+        # 文字列ID -> 書式NGか（lpr_top / lpr_bottom ごと、判定済みのIDは checked）
+        self.format_ng: dict[str, np.ndarray] = {'lpr_top': np.zeros(0, dtype=bool), 'lpr_bottom': np.zeros(0, dtype=bool)}
+        self.format_checked: dict[str, np.ndarray] = {'lpr_top': np.zeros(0, dtype=bool), 'lpr_bottom': np.zeros(0, dtype=bool)}
+
+    def __len__(self):
+        return len(self._views)
+
+    def intern(self, value: str) -> int:
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self.string_ids[value] = string_id
+        return string_id
+
+    def encode(self, kind: str, value):
+        if kind == 'str':
+            return self.intern(value)
+        elif kind == 'float':
+            return value if _is_number(value) else np.nan
+        elif kind == 'bool3':
+            return -1 if value is None else int(bool(value))
+        elif kind == 'bool':
+            return bool(value)
+        elif kind == 'status':
+            return value.value
+        elif kind == 'index':
+            return -1 if value is None else value.index
+
+    def decode(self, kind: str, value):
+        if kind == 'str':
+            return self.strings[value]
+        elif kind == 'float':
+            return None if value != value else float(value)
+        elif kind == 'bool3':
+            return None if value < 0 else bool(value)
+        elif kind == 'bool':
+            return bool(value)
+        elif kind == 'status':
+            return Status(int(value))
+        elif kind == 'index':
+            return None if value < 0 else self._views[value]
+
+    def get(self, name: str, index: int):
+        kind = self.kinds[name]
+        value = self.decode(kind, self.columns[name][index])
+        if kind == 'float' and value is not None and self.int_masks[name][index]:
+            return int(value)
+        return value
+
+    def set(self, name: str, index: int, value):
+        kind = self.kinds[name]
+        column = self.columns[name]
+        old = column[index]
+
+        column[index] = new = self.encode(kind, value)
+        if kind == 'float':
+            self.int_masks[name][index] = _is_int(value)
+            # None（NaN）同士は変更なし
+            changed = old != new and not (old != old and new != new)
+        else:
+            changed = old != new
+
+        if changed:
+            if name in ParkingInfo.DERIVED_SOURCES:
+                self.derive(index, index + 1)
+
+            for listener in self.listeners:
+                listener(name, index, old)
+
+    def reserve(self, size: int):
+        """列の配列の容量を size 件以上にする（足りない場合は倍に伸ばす）"""
+        if size <= self.capacity:
+            return
+
+        capacity = max(size, 2 * self.capacity, 1024)
+        used = len(self)
+        for buffers in (self.buffers, self.mask_buffers):
+            for name, buffer in buffers.items():
+                grown = np.empty(capacity, dtype=buffer.dtype)
+                grown[:used] = buffer[:used]
+                buffers[name] = grown
+        self.capacity = capacity
+
+    def extend(self, rows: list[dict]):
+        """ParkingInfo.extract が返す形式の行を追加する（ラベル列は行に含まれていればその値、無ければ初期値）
+
+        読み込み中に少しずつ追加しても全体のコピーが増えないよう、配列は reserve で倍々に確保する。
+        """
+        start = len(self)
+        count = len(rows)
+        end = start + count
+        self.reserve(end)
+
+        for name, kind in self.kinds.items():
+            dtype = Column.DTYPES[kind]
+            column = self.columns[name] = self.buffers[name][:end]
+            if name in ParkingInfo.DERIVED:
+                column[start:end] = self.encode(kind, None)
+            elif name in ParkingInfo.LABELS:
+                default = Status.NoLabel if kind == 'status' else None
+                column[start:end] = np.fromiter((self.encode(kind, row.get(name, default)) for row in rows), dtype=dtype, count=count)
+            else:
+                values = [row.get(name) for row in rows]
+                if kind == 'float':
+                    invalid = [value for value in values if value is not None and not _is_number(value)]
+                    if invalid:
+                        print(f'[{name}] Not a number: {len(invalid)} ({", ".join(map(repr, invalid[:3]))})')
+                column[start:end] = np.fromiter((self.encode(kind, value) for value in values), dtype=dtype, count=count)
+
+            if kind == 'float':
+                int_mask = self.int_masks[name] = self.mask_buffers[name][:end]
+                int_mask[start:end] = np.fromiter((_is_int(row.get(name)) for row in rows), dtype=bool, count=count)
+
+        self.json_data.extend(row.get('json_data') for row in rows)
+        self._views.extend(ParkingInfo(self, index) for index in range(start, start + count))
+
+        self.derive(start, start + count)
+
+    def derive(self, start: int, end: int):
+        """ParkingInfo.DERIVED の列（is_conf_ng / is_top_format_ng / is_bottom_format_ng）を計算する
+
+        書式チェックは重複を除いた文字列ごとに1回だけ正規表現を適用する。
+        """
+        columns = self.columns
+        vehicle_status = columns['vehicle_status'][start:end]
+        moving = vehicle_status == self.string_ids.get('Moving', -1)
+        stop = vehicle_status == self.string_ids.get('Stop', -1)
+
+        columns['conf_ng'][start:end] = moving & (columns['plate_confidence'][start:end] < CONF_NG_THRESHOLD)
+
+        for name, field, pattern in (('top_format_ng', 'lpr_top', TOP_FORMAT), ('bottom_format_ng', 'lpr_bottom', BOTTOM_FORMAT)):
+            string_ids = columns[field][start:end]
+            lookup, checked = self.format_lookup(field)
+            for string_id in np.unique(string_ids[stop & ~checked[string_ids]]):
+                string_id = int(string_id)
+                # Noneは書式NG
+                lookup[string_id] = string_id == 0 or pattern.match(self.strings[string_id]) is None
+                checked[string_id] = True
+
+            columns[name][start:end] = stop & lookup[string_ids]
+
+    def format_lookup(self, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """文字列ID -> 書式NGか / 判定済みか の配列（strings が増えた場合は倍々に伸ばす）"""
+        lookup = self.format_ng[field]
+        checked = self.format_checked[field]
+        if len(lookup) < len(self.strings):
+            size = max(len(self.strings), 2 * len(lookup))
+            lookup = self.format_ng[field] = np.concatenate((lookup, np.zeros(size - len(lookup), dtype=bool)))
+            checked = self.format_checked[field] = np.concatenate((checked, np.zeros(size - len(checked), dtype=bool)))
+        return lookup, checked
+
+    def views(self) -> list[ParkingInfo]:
+        return self._views
+
+    def string_column(self, name: str) -> np.ndarray:
+        """文字列列をobject配列として返す"""
+        return np.asarray(self.strings, dtype=object)[self.columns[name]]
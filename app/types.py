@@ -1,5 +1,4 @@
 from enum import Enum
-from PyQt6.QtCore import Qt
 
 class Status(Enum):
     NoLabel = 0
@@ -18,20 +17,6 @@ class Status(Enum):
     MovingOut = 13
 
 
-key_status_map = {
-    Qt.Key.Key_1: Status.OK,
-    Qt.Key.Key_2: Status.NG_Out,
-    Qt.Key.Key_3: Status.NG_Shadow,
-    Qt.Key.Key_4: Status.NG_Occlusion,
-    Qt.Key.Key_5: Status.NG_FP,
-    Qt.Key.Key_6: Status.NG_Blur,
-    Qt.Key.Key_7: Status.NG_OverExposure,
-    Qt.Key.Key_8: Status.NG_AI,
-    Qt.Key.Key_9: Status.NG_Others,
-    Qt.Key.Key_0: Status.Wrong_Out,
-}
-
-
 def text_for(status: Status):
     if status == Status.NoLabel:
         return ''
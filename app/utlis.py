@@ -13,6 +13,11 @@ def parse_timestamp(ts: str) -> datetime:
     # JST に変換
     return dt_utc.astimezone(JST)
 
+def to_timestamp(dt: datetime) -> str:
+    """datetime → UTCフォーマット YYYYMMDDhhmmssSSS（parse_timestamp の逆変換）"""
+    dt_utc = dt.astimezone(timezone.utc)
+    return dt_utc.strftime("%Y%m%d%H%M%S") + f"{int(dt_utc.microsecond / 1000):03d}"
+
 def format_jst(dt: datetime) -> str:
     """JST datetime を 'YYYY/MM/DD HH:MM:SS.mmm' 形式に変換"""
     return dt.strftime("%Y/%m/%d %H:%M:%S.") + f"{int(dt.microsecond / 1000):03d}"
@@ -1,10 +1,11 @@
 import os
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QComboBox, QCheckBox, QPushButton, QApplication, QFrame
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QComboBox, QCheckBox, QPushButton, QApplication, QFrame, QLineEdit
 from PyQt6.QtGui import QPixmap, QGuiApplication, QIcon, QPalette
 from PyQt6.QtCore import Qt, QEvent
 
 from app.views.image_label import ClickableImageLabel
+from app.views.image_loader import image_key
 from app.models.parking_info import ParkingInfo
 from app.types import Status, text_for
 
@@ -32,6 +33,11 @@ class FilterWidget(QFrame):
         self.filter_option_combo.addItems(['None', 'GT不明', '入庫見逃し', '出庫見逃し', '誤入庫（FP）', '誤入庫（隣接）', '初回=True', '初回=False', 'PlateConf=NG', 'PlateConf=OK', 'TopFormat=NG', 'TopFormat=OK', 'BottomFormat=NG', 'BottomFormat=OK', 'MoveY=NG', 'MoveY=OK'])
         layout.addWidget(self.filter_option_combo)
 
+        # 条件式（例: lot=="00" and status in (NG_Blur, NG_Shadow) and plate_confidence<0.4）
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText('条件式（Enterで適用）')
+        layout.addWidget(self.query_edit)
+
         self.filter_index_label = QLabel()
         self.filter_index_label.setFocusPolicy(Qt.FocusPolicy.NoFocus)  # フォーカスポリシーを設定
         layout.addWidget(self.filter_index_label)
@@ -59,6 +65,10 @@ class FilterWidget(QFrame):
                 return True
         return super().eventFilter(watched, event)
 
+    def image_keys(self, info: ParkingInfo, it_dir: str, raw_dir: str) -> list[tuple]:
+        """info の画像の ImageLoader のキー（先読み用）"""
+        return [image_key(os.path.join(raw_dir, info.name() + '_raw.jpg'), self.raw_label.scale)]
+
     def set_info(self, infos: list[ParkingInfo], index: int, it_dir: str, raw_dir: str):
         info = infos[index]
         self.info = info
@@ -7,6 +7,7 @@ from pathlib import Path
 
 from app.models.parking_info import ParkingInfo
 from app.types import Status
+from app.views.image_loader import get_image_loader, image_key
 
 class ClickableImageLabel(QLabel):
     def __init__(self, show_status_rect: bool = False, show_plate_rect: bool = False, show_vehicle_rect: bool = False, scale:int=1):
@@ -18,25 +19,45 @@ class ClickableImageLabel(QLabel):
         self.show_plate_rect = show_plate_rect
         self.show_vehicle_rect = show_vehicle_rect
         self.info: ParkingInfo = None
+
+        # 表示中（または読み込み待ち）の画像のキー
+        self.key: tuple = None
+        get_image_loader().loaded.connect(self.on_loaded)
         
         self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))  # 手のアイコンに変更
 
     def set(self, image_path: str, info: ParkingInfo, rect: QRect = None):
         self.info = info
-        if os.path.exists(image_path):
+        loader = get_image_loader()
+        if loader.exists(image_path):
             self.image_path = Path(image_path)
-            pixmap = QPixmap(str(self.image_path))
-            
-            # rectが指定されている場合はクロップする
-            if rect is not None:
-                pixmap = pixmap.copy(rect)
-            
-            scaled_pixmap = pixmap.scaled(pixmap.width() // self.scale, pixmap.height() // self.scale, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.setPixmap(scaled_pixmap)
+            self.key = image_key(image_path, self.scale, rect)
+
+            # 読み込み済みならすぐに表示し、未読み込みならバックグラウンドで読む
+            # 読み込むまでは、同じ画像の別の縮小率の読み込み済みの画像（無ければ Loading...）を表示する
+            pixmap = loader.get(self.key)
+            if pixmap is not None:
+                self.setPixmap(pixmap)
+            else:
+                placeholder = loader.placeholder(self.key)
+                if placeholder is not None:
+                    self.setPixmap(placeholder)
+                else:
+                    # 前のフレームの画像に新しいフレームの枠を重ねて表示しない
+                    self.clear()
+                    self.setText('Loading...')
+                loader.request(self.key)
             self.setToolTip("Reveal in Finder")
         else:
+            self.key = None
             self.clear()
             self.setText('No Image')
+
+    def on_loaded(self, key: tuple):
+        if key == self.key:
+            pixmap = get_image_loader().peek(key)
+            if pixmap is not None:
+                self.setPixmap(pixmap)
             
     def mousePressEvent(self, event):
         if self.image_path is None:
@@ -65,7 +86,8 @@ class ClickableImageLabel(QLabel):
     def paintEvent(self, event):
         super().paintEvent(event)    
 
-        if self.info is None:
+        # 画像が無い（No Image / 読み込み中）場合は枠を描かない
+        if self.info is None or self.pixmap().isNull():
             return
 
         painter = QPainter(self)
@@ -0,0 +1,272 @@
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+from PyQt6.QtCore import Qt, QCoreApplication, QObject, QRect, QSize, QRunnable, QThreadPool, pyqtSignal
+
+from app.models.asset_index import AssetIndex
+from app.views.thumbnail_cache import ThumbnailCache
+
+
+# 画像のキー: (パス, 縮小率, クロップ範囲 (x, y, w, h) または None)
+def image_key(path: str, scale: int = 1, rect: QRect = None) -> tuple:
+    crop = (rect.x(), rect.y(), rect.width(), rect.height()) if rect is not None else None
+    return (str(path), scale, crop)
+
+
+def decode_image(key: tuple) -> QImage:
+    """画像を読み込み、クロップ・縮小した QImage を返す（ワーカースレッドから呼ばれる）
+
+    QImageReader でクロップ範囲だけを、表示サイズで直接デコードする（JPEGは縮小デコードになる）。
+    """
+    path, scale, crop = key
+
+    reader = QImageReader(path)
+    size = reader.size()
+    if not size.isValid():
+        return reader.read()
+
+    # rectが指定されている場合はクロップする
+    if crop is not None:
+        clip = QRect(*crop)
+        if not QRect(0, 0, size.width(), size.height()).contains(clip):
+            # 画像の外にはみ出す範囲は QImage.copy と同じく塗りつぶして切り出す
+            image = reader.read().copy(clip)
+            return image.scaled(image.width() // scale, image.height() // scale, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+        reader.setClipRect(clip)
+        size = clip.size()
+
+    if scale > 1:
+        reader.setScaledSize(size.scaled(QSize(size.width() // scale, size.height() // scale), Qt.AspectRatioMode.KeepAspectRatio))
+
+    return reader.read()
+
+
+class DecodeTask(QRunnable):
+    def __init__(self, loader: 'ImageLoader', key: tuple):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+
+    def run(self):
+        # 先読みの範囲から外れた画像は読まない
+        if not self.loader.is_wanted(self.key):
+            self.loader.cancel(self.key)
+            return
+
+        image = self.loader.decode(self.key)
+        try:
+            self.loader.decoded.emit(self.key, image)
+        except RuntimeError:
+            # 終了処理で ImageLoader が破棄された後
+            pass
+
+
+class ImageCache:
+    """(パス, 縮小率, クロップ範囲) をキーに QPixmap を保持するLRUキャッシュ（上限はメガバイト単位）"""
+
+    def __init__(self, max_mb: float = 512):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.items: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self.bytes = 0
+
+        # パス -> そのパスのキー（別の縮小率の画像を探すため）
+        self.paths: dict[str, set[tuple]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: tuple):
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def size_of(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key: tuple) -> QPixmap:
+        pixmap = self.items.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.items.move_to_end(key)
+        return pixmap
+
+    def put(self, key: tuple, pixmap: QPixmap):
+        old = self.items.pop(key, None)
+        if old is not None:
+            self.bytes -= self.size_of(old)
+
+        self.items[key] = pixmap
+        self.bytes += self.size_of(pixmap)
+        self.paths.setdefault(key[0], set()).add(key)
+
+        # 古いものから上限に収まるまで捨てる（最後に追加したものは残す）
+        while self.bytes > self.max_bytes and len(self.items) > 1:
+            evicted_key, evicted = self.items.popitem(last=False)
+            self.bytes -= self.size_of(evicted)
+            self.evictions += 1
+
+            keys = self.paths[evicted_key[0]]
+            keys.discard(evicted_key)
+            if not keys:
+                del self.paths[evicted_key[0]]
+
+    def clear(self):
+        self.items.clear()
+        self.paths.clear()
+        self.bytes = 0
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total > 0 else 0
+        return (f'Hit: {self.hits}, Miss: {self.misses} ({rate:.1f}% hit), Evicted: {self.evictions}, '
+                f'Images: {len(self.items)}, Size: {self.bytes / 1024 / 1024:.1f} / {self.max_bytes / 1024 / 1024:.0f} MB')
+
+
+class ImageLoader(QObject):
+    """QThreadPool で画像をバックグラウンドで読み込み、結果を ImageCache に保持する
+
+    表示中の画像を優先して読み、前後のフレームの画像を先読みする。
+    読み込みが終わると loaded(key) を通知する。
+    """
+
+    decoded = pyqtSignal(tuple, QImage)
+    loaded = pyqtSignal(tuple)
+
+    VISIBLE_PRIORITY = 1
+    PREFETCH_PRIORITY = 0
+
+    def __init__(self, max_mb: float = 512, threads: int = 0):
+        super().__init__()
+
+        self.pool = QThreadPool()
+        if threads > 0:
+            self.pool.setMaxThreadCount(threads)
+
+        self.cache = ImageCache(max_mb)
+
+        # 縮小画像のキャッシュ（データフォルダの読み込み時に設定する）
+        self.thumbnails: ThumbnailCache = None
+
+        # IT/RAW のファイル一覧（データフォルダの読み込み時に設定する）
+        self.assets: AssetIndex = None
+
+        self.lock = threading.Lock()
+        self.pending: set[tuple] = set()
+        # 利用側（labeling / review）ごとの、読み込みが必要な画像
+        self.wanted: dict[str, set[tuple]] = {}
+
+        self.decoded.connect(self.on_decoded)
+
+    def get(self, key: tuple) -> QPixmap:
+        return self.cache.get(key)
+
+    def exists(self, path: str) -> bool:
+        if self.assets is not None:
+            return self.assets.exists(path)
+        return os.path.exists(path)
+
+    def decode(self, key: tuple) -> QImage:
+        """縮小画像があればそれを、無ければ元画像を読む（ワーカースレッドから呼ばれる）"""
+        path, scale, crop = key
+        thumbnails = self.thumbnails
+        if thumbnails is not None and crop is None:
+            thumbnail = thumbnails.lookup(path, scale)
+            if thumbnail is not None:
+                image = QImage(thumbnail)
+                if not image.isNull():
+                    return image
+        return decode_image(key)
+
+    def peek(self, key: tuple) -> QPixmap:
+        """ヒット/ミスの集計に含めずにキャッシュを参照する"""
+        return self.cache.items.get(key)
+
+    def placeholder(self, key: tuple) -> QPixmap:
+        """key の画像の読み込み中に表示する、同じ画像の別の縮小率の読み込み済みの画像（表示サイズに拡大・縮小する）"""
+        path, scale, crop = key
+        others = [other for other in self.cache.paths.get(path, ()) if other[2] == crop and other != key]
+        if not others:
+            return None
+
+        # 縮小率が最も近いもの
+        other = min(others, key=lambda other: abs(other[1] - scale))
+        pixmap = self.cache.items[other]
+        ratio = other[1] / scale
+        return pixmap.scaled(round(pixmap.width() * ratio), round(pixmap.height() * ratio),
+                             Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
+
+    def request(self, key: tuple, visible: bool = True, client: str = 'labeling'):
+        """未読み込みの画像の読み込みを予約する"""
+        if key in self.cache:
+            return
+
+        with self.lock:
+            self.wanted.setdefault(client, set()).add(key)
+            if key in self.pending:
+                return
+            self.pending.add(key)
+
+        priority = self.VISIBLE_PRIORITY if visible else self.PREFETCH_PRIORITY
+        self.pool.start(DecodeTask(self, key), priority)
+
+    def prefetch(self, visible: list[tuple], neighbors: list[tuple], client: str = 'labeling'):
+        """client の表示中の画像と先読みする画像を指定する（client のそれ以外の予約済みの読み込みは取り消す）
+
+        予約は client ごとに持つので、labeling タブの表示の更新で review タブの読み込みは取り消されない。
+        """
+        neighbors = [key for key in neighbors if self.exists(key[0])]
+        with self.lock:
+            self.wanted[client] = set(visible) | set(neighbors)
+
+        for key in visible:
+            self.request(key, visible=True, client=client)
+        for key in neighbors:
+            self.request(key, visible=False, client=client)
+
+    def shutdown(self):
+        """予約済みの読み込みを取り消し、実行中の読み込みの終了を待つ"""
+        with self.lock:
+            self.wanted = {}
+        self.pool.clear()
+        self.pool.waitForDone()
+
+    def is_wanted(self, key: tuple) -> bool:
+        with self.lock:
+            return any(key in wanted for wanted in self.wanted.values())
+
+    def cancel(self, key: tuple):
+        with self.lock:
+            self.pending.discard(key)
+
+    def on_decoded(self, key: tuple, image: QImage):
+        with self.lock:
+            self.pending.discard(key)
+
+        # QPixmap はGUIスレッドでのみ作れる
+        self.cache.put(key, QPixmap.fromImage(image))
+        self.loaded.emit(key)
+
+
+image_loader: ImageLoader = None
+
+
+# 画像キャッシュの上限（MB、ImageLoader の生成前に変更する）
+image_cache_mb = 512
+
+
+def get_image_loader() -> ImageLoader:
+    """全ウィジェットで共有する ImageLoader（QApplication の生成後に作る）"""
+    global image_loader
+    if image_loader is None:
+        image_loader = ImageLoader(image_cache_mb)
+        QCoreApplication.instance().aboutToQuit.connect(image_loader.shutdown)
+    return image_loader
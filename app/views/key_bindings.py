@@ -0,0 +1,17 @@
+from PyQt6.QtCore import Qt
+
+from app.types import Status
+
+
+key_status_map = {
+    Qt.Key.Key_1: Status.OK,
+    Qt.Key.Key_2: Status.NG_Out,
+    Qt.Key.Key_3: Status.NG_Shadow,
+    Qt.Key.Key_4: Status.NG_Occlusion,
+    Qt.Key.Key_5: Status.NG_FP,
+    Qt.Key.Key_6: Status.NG_Blur,
+    Qt.Key.Key_7: Status.NG_OverExposure,
+    Qt.Key.Key_8: Status.NG_AI,
+    Qt.Key.Key_9: Status.NG_Others,
+    Qt.Key.Key_0: Status.Wrong_Out,
+}
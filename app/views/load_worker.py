@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from app.controllers.data_manager import iter_rows, read_label_rows, label_values
+from app.models.asset_index import AssetIndex
+from app.models.parking_info import ParkingInfo
+from app.views.thumbnail_cache import ThumbnailCache
+
+
+class LoadWorker(QThread):
+    """META jsonの読み込みをバックグラウンドで行い、読み込んだ行を少しずつ GUI スレッドに渡す
+
+    rows_loaded(行のリスト, 読み込んだファイル数, ファイル総数) は BATCH_INTERVAL_SEC ごとに通知する。
+    RecordStore への追加は GUI スレッドで行う（このスレッドからは触らない）。
+    label.csv のラベルはこのスレッドで行に加えておき、GUI スレッドでは RecordStore.extend だけを行う。
+    IT/RAW のファイル一覧（AssetIndex）と縮小画像の一覧（ThumbnailCache、使う場合のみ）もこのスレッドで作り、
+    最初の行より先に assets_indexed で渡す。
+    """
+
+    assets_indexed = pyqtSignal(object, object)
+    rows_loaded = pyqtSignal(list, int, int)
+    # 読み込みの終了（中止またはエラーで途中までの場合は True）
+    completed = pyqtSignal(bool)
+
+    BATCH_INTERVAL_SEC = 0.2
+
+    def __init__(self, path: str, meta_dir: str, workers: int = 0, use_cache: bool = True, keep_json: bool = False, use_thumbnails: bool = False):
+        super().__init__()
+        self.path = path
+        self.meta_dir = meta_dir
+        self.workers = workers
+        self.use_cache = use_cache
+        self.keep_json = keep_json
+        self.use_thumbnails = use_thumbnails
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        rows = []
+        done = 0
+        total = 0
+        last = time.monotonic()
+        interrupted = False
+
+        # IT/RAW のファイル一覧（画像の有無の判定と、読み込み後の報告に使う）
+        assets = AssetIndex(self.path)
+        thumbnails = ThumbnailCache(self.path) if self.use_thumbnails else None
+        self.assets_indexed.emit(assets, thumbnails)
+        # 読み込んだフレーム（TimeStamp, 画像のファイル名の先頭）
+        frames = []
+
+        # 読み込みながら設定するラベル（json -> 行）
+        label_csv = os.path.join(self.path, 'label.csv')
+        label_rows = read_label_rows(label_csv)
+
+        parsed = iter_rows(self.path, self.meta_dir, self.workers, use_cache=self.use_cache, keep_json=self.keep_json)
+        try:
+            for row, done, total in parsed:
+                if self.cancel_event.is_set():
+                    interrupted = True
+                    break
+
+                if row is not None:
+                    label_row = label_rows.pop(row['json_file'], None)
+                    if label_row is not None:
+                        row.update(label_values(label_row))
+                    rows.append(row)
+                    frames.append((row['timestamp'], ParkingInfo.frame_name(row['timestamp'], row['lot'], row['is_ps'])))
+
+                now = time.monotonic()
+                if now - last >= self.BATCH_INTERVAL_SEC:
+                    self.rows_loaded.emit(rows, done, total)
+                    rows = []
+                    last = now
+        except Exception as e:
+            print('[load] Failed:', e)
+            interrupted = True
+        finally:
+            # 未着手のパースを取り消し、パース済みの分をキャッシュに書き込む
+            parsed.close()
+
+        if not interrupted and label_rows:
+            unmatched = list(label_rows)
+            examples = ', '.join(unmatched[:5]) + (', ...' if len(unmatched) > 5 else '')
+            print(f'[{os.path.basename(label_csv)}] Unmatched rows: {len(unmatched)} ({examples})')
+
+        # 画像が無いフレームの報告
+        if frames:
+            assets.report(frames)
+
+        self.rows_loaded.emit(rows, done, total)
+        self.completed.emit(interrupted)
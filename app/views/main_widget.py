@@ -1,30 +1,97 @@
 import os
+import time
+
+import numpy as np
 
 from PyQt6.QtWidgets import (
-    QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QComboBox, QMainWindow, QToolBar, QFileDialog, QLabel, QTabWidget, QTableWidget, QTableWidgetItem, QCheckBox)
-from PyQt6.QtCore import Qt, QEvent
+    QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QComboBox, QMainWindow, QToolBar, QFileDialog, QLabel, QTabWidget, QTableWidget, QTableWidgetItem, QCheckBox, QProgressBar)
+from PyQt6.QtCore import Qt, QEvent, QTimer
 from PyQt6.QtGui import QAction, QKeySequence, QShortcut, QGuiApplication
 
 
-from app.types import Status, text_for, key_status_map
+from app.types import Status, text_for
+from app.views.key_bindings import key_status_map
 from app.models.parking_info import ParkingInfo
 from app.views.park_widget import ParkWidget
 from app.views.filter_widget import FilterWidget
-from app.controllers.data_manager import load, eval, save_label, save_eval
+from app.views.review_widget import ReviewWidget
+from app.views.table_widget import TableWidget
+from app.views.image_loader import get_image_loader
+from app.views.thumbnail_cache import ThumbnailCache, ThumbnailBuilder
+from app.controllers.data_manager import find_meta_dir, save_label, save_eval
+from app.controllers.eval_accumulator import EvalAccumulator
+from app.models.filter_index import FilterIndex
+from app.models.filter_query import FilterQuery, QueryError
+from app.models.asset_index import AssetIndex
+from app.models.record_store import RecordStore
+from app.views.load_worker import LoadWorker
+
+# フィルタパネルのオプション（先頭の None を除く）: (FilterIndex.flag の名前, 値)
+FILTER_OPTIONS = [
+    ('is_gt_unknown', True),
+    ('is_miss_in', True),
+    ('is_miss_out', True),
+    ('is_wrong_in_by_fp', True),
+    ('is_wrong_in_by_side_lot', True),
+    ('is_first', True),
+    ('is_first', False),
+    ('conf_ng', True),
+    ('conf_ng', False),
+    ('top_format_ng', True),
+    ('top_format_ng', False),
+    ('bottom_format_ng', True),
+    ('bottom_format_ng', False),
+    ('move_y_ng', True),
+    ('move_y_ng', False),
+]
+
+# 表示の更新間隔（ms）: キーリピートなどで連続して移動しても、表示の更新はこの間隔に1回
+FRAME_INTERVAL_MS = 16
+
+# 先読みの範囲の外側で、低解像度の画像（FilterWidget と同じ縮小率）を先読みするフレーム数（prefetch の倍数）
+PREVIEW_RANGE = 4
 
 class MainWidget(QMainWindow):
-    def __init__(self, frames):
+    def __init__(self, frames, workers: int = 0, use_cache: bool = True, keep_json: bool = False, check_eval: bool = False, prefetch: int = 3, build_thumbnails: bool = False, thumbnail_workers: int = 0):
         super().__init__()
 
         self.frames = frames
+        self.prefetch = prefetch
+        self.build_thumbnails = build_thumbnails
+        self.thumbnail_workers = thumbnail_workers
+        self.thumbnail_builder: ThumbnailBuilder = None
+        self.workers = workers
+        self.use_cache = use_cache
+        self.keep_json = keep_json
+        self.check_eval = check_eval
         self.path = None
         self.infos: list[ParkingInfo] = []
+        self.eval_accumulator = None
+        self.filter_masks = None
+        self.current_positions = None
+        self.query: FilterQuery = None
+
+        # バックグラウンドの読み込み
+        self.load_worker: LoadWorker = None
+        self.loading = False
+        self.load_partial = False
+        # 最初の進捗の通知の (時刻, 読み込んだファイル数)
+        self.load_started: tuple = None
+        self.assets: AssetIndex = None
 
         self.park_widgets: list[ParkWidget] = []
+        # park_widgets（左から順）が表示している current_infos の位置（未表示・要更新は None）
+        self.pane_indices: list[int] = [None] * self.frames
         self.filter_widgets: list[FilterWidget] = []
 
         self.json_window = None
 
+        # 表示の更新の予約（update_views）と、最後に表示を更新した時刻
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.timeout.connect(self.render_views)
+        self.last_render = 0.0
+
         self.tabs = QTabWidget()
         
         # Label tab
@@ -45,6 +112,7 @@ class MainWidget(QMainWindow):
         self.filter_widget = FilterWidget()
         self.filter_widget.filter_combo.currentIndexChanged.connect(self.update_index)
         self.filter_widget.filter_option_combo.currentIndexChanged.connect(self.update_index)
+        self.filter_widget.query_edit.returnPressed.connect(self.on_query_entered)
         side_layout.addWidget(self.filter_widget)
         # self.filter_widgets.append(filter_widget)
 
@@ -56,6 +124,7 @@ class MainWidget(QMainWindow):
         side_layout.addWidget(label_help)
         layout.addLayout(side_layout)
 
+        self.pane_layout = layout
         for i in range(0, self.frames):
             park_widget = ParkWidget()
             layout.addWidget(park_widget)
@@ -65,6 +134,17 @@ class MainWidget(QMainWindow):
         # Eval tab
         self.eval_view = QTableWidget(23, 3)
         self.tabs.addTab(self.eval_view, 'eval')
+
+        # Review tab
+        self.review_widget = ReviewWidget()
+        self.review_widget.jump_requested.connect(self.jump_to)
+        self.review_widget.status_assigned.connect(self.update_views)
+        self.tabs.addTab(self.review_widget, 'review')
+
+        # Table tab
+        self.table_widget = TableWidget()
+        self.table_widget.jump_requested.connect(self.jump_to)
+        self.tabs.addTab(self.table_widget, 'table')
         self.tabs.currentChanged.connect(self.on_tabbar_clicked)
 
         # Toolbar
@@ -123,6 +203,17 @@ class MainWidget(QMainWindow):
         self.show_vehicle.stateChanged.connect(self.on_show_vehicle_changed)
         toolbar.addWidget(self.show_vehicle)
 
+        # 読み込みの進捗と中止ボタン（読み込み中のみ表示）
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+
+        self.cancel_load_button = QPushButton('Cancel')
+        self.cancel_load_button.clicked.connect(self.cancel_loading)
+        self.cancel_load_button.hide()
+        self.statusBar().addPermanentWidget(self.cancel_load_button)
+
         # self.setLayout(layout)
         self.setCentralWidget(self.tabs)
         self.setWindowTitle("park_eval")
@@ -132,6 +223,9 @@ class MainWidget(QMainWindow):
 
         # Prevent keyboard-driven focus movement and accidental widget value changes.
         self.disable_widget_key_interaction()
+        self.filter_widget.query_edit.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
+        self.review_widget.view.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.table_widget.view.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
     def disable_widget_key_interaction(self):
         for widget in self.findChildren(QWidget):
@@ -142,6 +236,10 @@ class MainWidget(QMainWindow):
         if len(self.infos) == 0:
             return False
 
+        # review / table タブのキー操作は一覧で処理する
+        if self.tabs.currentWidget() in (self.review_widget, self.table_widget):
+            return False
+
         if event.key() == Qt.Key.Key_Left:
             flag = self.info_index <= self.frames - 1
             self.info_index = len(self.current_infos) - 1 if flag else self.info_index - 1
@@ -163,7 +261,7 @@ class MainWidget(QMainWindow):
                 flag = self.filter_index <= 0
                 self.filter_index = len(self.filter_infos) - 1 if flag else self.filter_index - 1
 
-                self.info_index = self.current_infos.index(self.filter_infos[self.filter_index])
+                self.info_index = self.position_of(self.filter_infos[self.filter_index])
                 self.update_views()
             return True
 
@@ -172,12 +270,13 @@ class MainWidget(QMainWindow):
                 flag = self.filter_index >= len(self.filter_infos) - 1
                 self.filter_index = 0 if flag else self.filter_index + 1
 
-                self.info_index = self.current_infos.index(self.filter_infos[self.filter_index])
+                self.info_index = self.position_of(self.filter_infos[self.filter_index])
                 self.update_views()
             return True
 
         if event.key() in key_status_map.keys():
-            if len(self.current_infos) > 0:
+            # 読み込み中でフレームが frames 個に満たない場合は info_index が範囲外になる
+            if 0 <= self.info_index < len(self.current_infos):
                 selected_status = key_status_map[event.key()]
 
                 info = self.current_infos[self.info_index]
@@ -187,7 +286,7 @@ class MainWidget(QMainWindow):
             return True
 
         if event.key() == Qt.Key.Key_F:
-            if len(self.current_infos) > 0:
+            if 0 <= self.info_index < len(self.current_infos):
                 current_info = self.current_infos[self.info_index]
                 is_first = current_info.is_first
                 current_info.set_is_first(not is_first)
@@ -198,6 +297,10 @@ class MainWidget(QMainWindow):
         return False
 
     def eventFilter(self, watched, event):
+        # 条件式の入力欄はキー入力をそのまま受け取る
+        if watched in (self.filter_widget.query_edit, self.review_widget.view, self.table_widget.view):
+            return super().eventFilter(watched, event)
+
         if event.type() == QEvent.Type.KeyPress and isinstance(watched, QWidget):
             # Keep app-level key operations while disabling widget-side key interactions.
             if self._handle_global_key(event):
@@ -220,26 +323,146 @@ class MainWidget(QMainWindow):
             print("Not exitst")
             return
 
-        infos, lots = load(path)
-        if not infos:
+        meta_dir = find_meta_dir(path)
+        if meta_dir is None:
             print("No data founded.")
             return
-        
+
+        # 読み込み中のデータがあれば中止する
+        self.stop_loading()
+
+        if self.eval_accumulator is not None:
+            self.eval_accumulator.close()
+            self.eval_accumulator = None
+        if self.filter_masks is not None:
+            self.filter_masks.close()
+            self.filter_masks = None
+
+        # 読み込んだ行は少しずつ store に追加する（infos は store.views() なので追加に合わせて伸びる）
+        self.store = RecordStore(meta_dir)
+        self.store.listeners.append(self.on_record_changed)
+
         # Configure
-        self.infos = infos
-        self.current_infos = infos
-        self.lots = lots
+        self.infos = self.store.views()
+        self.current_infos = self.infos
+        # 表示条件（Lot / Moving / Stop / None）は読み込みの完了後に update_index で設定する
+        self.current_positions = None
+        self.lots = []
         self.info_index = self.frames - 1
+        self.invalidate_panes()
 
         self.filter_infos: list[ParkingInfo] = []
         self.filter_index = 0
         self.filter_widget.filter_combo.setCurrentIndex(0)
         self.filter_widget.filter_option_combo.setCurrentIndex(0)
+        self.lot_combo.clear()
+
+        # 前のフォルダのフレームを review / table タブに残さない（読み込みの完了まで空にする）
+        self.review_widget.set_infos([], '')
+        self.table_widget.set_store(self.store)
 
         self.path = path
         self.it_dir = os.path.join(path, 'IT')
         self.raw_dir = os.path.join(path, 'RAW')
 
+        # 縮小画像は作成済みのフォルダがある場合か、作成する場合だけ使う（無い場合は画像ごとの検索をしない）
+        use_thumbnails = self.build_thumbnails or ThumbnailCache.available(path)
+
+        # IT/RAW のファイル一覧と縮小画像の一覧は LoadWorker で作る（届くまでは前のフォルダの一覧を使わない）
+        self.assets = None
+        get_image_loader().assets = None
+        get_image_loader().thumbnails = None
+        if self.thumbnail_builder is not None:
+            self.thumbnail_builder.stop()
+            self.thumbnail_builder = None
+
+        self.loading = True
+        self.load_partial = False
+        self.load_started = None
+        self.load_progress.setRange(0, 0)
+        self.load_progress.show()
+        self.cancel_load_button.show()
+        self.statusBar().showMessage(f'Loading: {path}')
+
+        self.load_worker = LoadWorker(path, meta_dir, workers=self.workers, use_cache=self.use_cache, keep_json=self.keep_json, use_thumbnails=use_thumbnails)
+        self.load_worker.assets_indexed.connect(self.on_assets_indexed)
+        self.load_worker.rows_loaded.connect(self.on_rows_loaded)
+        self.load_worker.completed.connect(self.on_load_completed)
+        self.load_worker.start()
+
+    def cancel_loading(self):
+        """読み込みを中止する（読み込み済みのフレームはそのまま使える）"""
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+
+    def stop_loading(self):
+        """読み込み中であれば中止してワーカーの終了を待つ（読み込み済みの行の通知は捨てる）"""
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.load_worker.wait()
+            self.load_worker = None
+
+    def on_assets_indexed(self, assets: AssetIndex, thumbnails: ThumbnailCache):
+        if self.sender() is not self.load_worker:
+            return
+
+        # IT/RAW のファイル一覧（画像の有無の判定に使う）
+        self.assets = assets
+        get_image_loader().assets = assets
+
+        # 縮小画像のキャッシュ（作成済みのフォルダがある場合か、作成する場合のみ）
+        get_image_loader().thumbnails = thumbnails
+        if self.build_thumbnails:
+            self.thumbnail_builder = ThumbnailBuilder(thumbnails, [self.it_dir, self.raw_dir], self.thumbnail_workers)
+            self.thumbnail_builder.start()
+
+    def on_rows_loaded(self, rows: list, done: int, total: int):
+        # 中止した読み込みの通知は捨てる
+        if self.sender() is not self.load_worker:
+            return
+
+        # label.csv のラベルは LoadWorker で行に加えてある
+        self.store.extend(rows)
+        for row in rows:
+            if not row['lot'] in self.lots:
+                self.lots.append(row['lot'])
+
+        # 進捗（ファイル数/秒と残り時間、最初の通知からの平均で計算する）
+        now = time.monotonic()
+        if self.load_started is None:
+            self.load_started = (now, done)
+        started, started_done = self.load_started
+        rate = (done - started_done) / (now - started) if now > started else 0
+        eta = f'{(total - done) / rate:.0f}s' if rate > 0 else '-'
+        self.load_progress.setRange(0, max(total, 1))
+        self.load_progress.setValue(done)
+        self.statusBar().showMessage(f'Loading: {done} / {total} files ({rate:.0f} files/s, ETA {eta}), {len(self.infos)} frames')
+
+        if len(rows) > 0:
+            self.invalidate_panes()
+            self.update_views()
+
+    def on_load_completed(self, interrupted: bool):
+        if self.sender() is not self.load_worker:
+            return
+
+        self.load_worker.wait()
+        self.load_worker = None
+        self.loading = False
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
+
+        if not self.infos:
+            print("No data founded.")
+            self.statusBar().showMessage(f'No data: {self.path}')
+            return
+
+        # 途中で中止した場合は、未読み込みのフレームのラベルを失わないよう保存できなくする
+        self.load_partial = interrupted
+
+        self.eval_accumulator = EvalAccumulator(self.lots, self.infos, self_check=self.check_eval)
+        self.filter_masks = FilterIndex(self.store)
+
         self.lot_combo.clear()
         self.lot_combo.addItems(['All'] + self.lots)
         # self.on_lot_combo_changed(0)
@@ -247,9 +470,25 @@ class MainWidget(QMainWindow):
         self.update_index()
         # self.update_views()
 
-        self.statusBar().showMessage(f'Load: {path}')
+        # 読み込み中に開いていた eval / table タブを表示する（review タブは update_views で表示する）
+        if self.tabs.currentIndex() == 1:
+            self.update_eval_table()
+        if self.tabs.currentWidget() is self.table_widget:
+            self.table_widget.set_store(self.store)
+
+        if interrupted:
+            self.statusBar().showMessage(f'Load stopped: {self.path} ({len(self.infos)} frames, cannot save)')
+        else:
+            self.statusBar().showMessage(f'Load: {self.path}')
+
+    def closeEvent(self, event):
+        self.stop_loading()
+        super().closeEvent(event)
 
     def update_index(self):
+        if self.filter_masks is None:
+            return
+
         lot_index = self.lot_combo.currentIndex()
         show_moving = self.show_moving.isChecked()
         show_stop = self.show_stop.isChecked()
@@ -258,74 +497,92 @@ class MainWidget(QMainWindow):
         filter_option_index = self.filter_widget.filter_option_combo.currentIndex()
 
 
-        current_infos = self.infos if show_moving else [info for info in self.infos if info.vehicle_status != 'Moving']
-        current_infos = current_infos if show_stop else [info for info in current_infos if info.vehicle_status != 'Stop']
-        current_infos = current_infos if show_none else [info for info in current_infos if info.vehicle_status != None]
+        masks = self.filter_masks
+
+        mask = masks.all()
+        if not show_moving:
+            mask &= ~masks.vehicle_status('Moving')
+        if not show_stop:
+            mask &= ~masks.vehicle_status('Stop')
+        if not show_none:
+            mask &= ~masks.vehicle_status(None)
 
         # Filter by lot
-        if lot_index == 0:
-            self.current_infos = current_infos
-        else:
-            self.current_infos = [info for info in current_infos if info.lot == self.lots[lot_index - 1]]
+        if lot_index != 0:
+            mask &= masks.lot(self.lots[lot_index - 1])
+
+        views = self.store.views()
+        current = np.flatnonzero(mask)
+        self.current_infos = self.infos if len(current) == len(views) else [views[i] for i in current]
+        self.invalidate_panes()
+
+        # レコード番号 -> current_infos での位置（含まれない場合は -1）
+        self.current_positions = np.full(len(views), -1, dtype=np.int64)
+        self.current_positions[current] = np.arange(len(current))
 
         # For reset filter
-        if filter_status_index == 0 and filter_option_index == 0:
+        if filter_status_index == 0 and filter_option_index == 0 and self.query is None:
             self.filter_infos = []
             self.info_index = self.frames - 1
         else:
             # Filter by status
-            self.filter_infos = [info for info in self.current_infos if info.status == Status(filter_status_index - 1)] if filter_status_index > 0 else self.current_infos
+            if filter_status_index > 0:
+                mask &= masks.status(Status(filter_status_index - 1))
 
             # For no infos, reset filter
-            if len(self.filter_infos) == 0:
+            if not mask.any():
                 self.filter_widget.filter_combo.setCurrentIndex(0)
                 self.filter_widget.filter_option_combo.setCurrentIndex(0)
                 return
         
             # Filter by option
-            if filter_option_index == 1:
-                self.filter_infos = [info for info in self.filter_infos if info.is_gt_unknown == True]
-            elif filter_option_index == 2:
-                self.filter_infos = [info for info in self.filter_infos if info.is_miss_in == True]
-            elif filter_option_index == 3:
-                self.filter_infos = [info for info in self.filter_infos if info.is_miss_out == True]
-            elif filter_option_index == 4:
-                self.filter_infos = [info for info in self.filter_infos if info.is_wrong_in_by_fp == True]
-            elif filter_option_index == 5:
-                self.filter_infos = [info for info in self.filter_infos if info.is_wrong_in_by_side_lot == True]
-
-            elif filter_option_index == 6:
-                self.filter_infos = [info for info in self.filter_infos if info.is_first == True]
-            elif filter_option_index == 7:
-                self.filter_infos = [info for info in self.filter_infos if info.is_first == False]
-            elif filter_option_index == 8:
-                self.filter_infos = [info for info in self.filter_infos if info.is_conf_ng()]
-            elif filter_option_index == 9:
-                self.filter_infos = [info for info in self.filter_infos if not info.is_conf_ng()]
-            elif filter_option_index == 10:
-                self.filter_infos = [info for info in self.filter_infos if info.is_top_format_ng()]
-            elif filter_option_index == 11:
-                self.filter_infos = [info for info in self.filter_infos if not info.is_top_format_ng()]  
-            elif filter_option_index == 12:
-                self.filter_infos = [info for info in self.filter_infos if info.is_bottom_format_ng()]
-            elif filter_option_index == 13:
-                self.filter_infos = [info for info in self.filter_infos if not info.is_bottom_format_ng()]
-            elif filter_option_index == 14:
-                self.filter_infos = [info for info in self.filter_infos if info.is_move_y_ng()]
-            elif filter_option_index == 15:
-                self.filter_infos = [info for info in self.filter_infos if not info.is_move_y_ng()]
+            if filter_option_index > 0:
+                name, value = FILTER_OPTIONS[filter_option_index - 1]
+                mask &= masks.flag(name) if value else ~masks.flag(name)
+
+            # Filter by query
+            if self.query is not None:
+                mask &= self.query(masks)
+
+            self.filter_infos = [views[i] for i in np.flatnonzero(mask)]
             
             # For no infos, reset filter
             if len(self.filter_infos) == 0:
+                if self.query is not None:
+                    self.statusBar().showMessage(f'No match: {self.query.text}')
+                    self.update_views()
+                    return
                 self.filter_widget.filter_option_combo.setCurrentIndex(0)
                 return
 
             self.filter_index = 0
-            self.info_index = self.current_infos.index(self.filter_infos[self.filter_index])
+            self.info_index = self.position_of(self.filter_infos[self.filter_index])
 
         self.update_views()
 
 
+    def on_query_entered(self):
+        text = self.filter_widget.query_edit.text().strip()
+        self.filter_widget.query_edit.clearFocus()
+
+        if not text:
+            self.query = None
+        else:
+            try:
+                self.query = FilterQuery(text)
+            except QueryError as e:
+                self.statusBar().showMessage(f'Query error: {e}')
+                return
+
+        if self.infos:
+            self.update_index()
+
+    def position_of(self, info: ParkingInfo) -> int:
+        """current_infos での info の位置（含まれない場合、読み込みが完了していない場合は -1）"""
+        if self.current_positions is None or info.index >= len(self.current_positions):
+            return -1
+        return int(self.current_positions[info.index])
+
     def keyPressEvent(self, event):
         if self._handle_global_key(event):
             return
@@ -333,6 +590,18 @@ class MainWidget(QMainWindow):
         super().keyPressEvent(event)
 
     def update_views(self):
+        """表示の更新を予約する
+
+        キーリピートで連続して呼ばれても、表示は FRAME_INTERVAL_MS に1回だけ、その時点の info_index で更新する。
+        """
+        if self.render_timer.isActive():
+            return
+        elapsed_ms = (time.monotonic() - self.last_render) * 1000
+        self.render_timer.start(max(0, int(FRAME_INTERVAL_MS - elapsed_ms)))
+
+    def render_views(self):
+        self.last_render = time.monotonic()
+
         if len(self.filter_infos) > 0:
             self.filter_widget.filter_index_label.setText(f'({self.filter_index + 1} / {len(self.filter_infos)})')
             self.filter_widget.set_info(self.filter_infos, self.filter_index, self.it_dir, self.raw_dir)
@@ -343,21 +612,99 @@ class MainWidget(QMainWindow):
         #     index = self.filter_index + i
         #     if index < len(self.filter_infos):
 
-        for i in range(0, self.frames):
-            index = self.info_index - self.frames + 1 + i
+        self.render_panes()
+
+        self.prefetch_images()
+        self.update_review()
+
+    def render_panes(self):
+        """info_index を右端とする frames 個のフレームを ParkWidget に表示する
+
+        前回から表示し続けるフレームの ParkWidget は並べ替えてそのまま使い、新しく表示するフレームだけ set_info する
+        （1フレームの移動では1個だけ）。
+        """
+        indices = [self.info_index - self.frames + 1 + i for i in range(self.frames)]
+        shown = {index: widget for index, widget in zip(self.pane_indices, self.park_widgets) if index is not None}
+        free = [widget for index, widget in zip(self.pane_indices, self.park_widgets) if index is None or index not in indices]
+
+        widgets = []
+        pane_indices = []
+        for index in indices:
+            widget = shown.get(index)
+            if widget is None:
+                widget = free.pop(0)
+                if 0 <= index < len(self.current_infos):
+                    widget.set_info(self.current_infos, index, self.it_dir, self.raw_dir)
+                else:
+                    index = None
+            widgets.append(widget)
+            pane_indices.append(index)
+
+        if widgets != self.park_widgets:
+            for widget in widgets:
+                self.pane_layout.removeWidget(widget)
+            for widget in widgets:
+                self.pane_layout.addWidget(widget)
+            self.park_widgets = widgets
+        self.pane_indices = pane_indices
+
+    def invalidate_panes(self):
+        """次の表示の更新で全ての ParkWidget を set_info し直す"""
+        self.pane_indices = [None] * self.frames
+
+    def on_record_changed(self, name: str, index: int, old):
+        # ParkWidget は前のフレームとの差分も表示するので、変更があれば全て更新する
+        self.invalidate_panes()
+
+    def prefetch_images(self):
+        """表示中のフレームとフィルタ結果の前後 prefetch フレームの画像を先読みする（その外側は低解像度のRAW画像のみ）"""
+        visible = [label.key for label in self.image_labels() if label.key is not None]
+        neighbors = []
+
+        def add_frames(end: int):
+            # end を右端とする表示範囲の前後
+            for index in range(end - self.frames + 1 - self.prefetch, end + self.prefetch + 1):
+                if 0 <= index < len(self.current_infos):
+                    neighbors.extend(self.park_widgets[0].image_keys(self.current_infos[index], self.it_dir, self.raw_dir))
+
+        add_frames(self.info_index)
+
+        if len(self.filter_infos) > 0:
+            for offset in range(-self.prefetch, self.prefetch + 1):
+                info = self.filter_infos[(self.filter_index + offset) % len(self.filter_infos)]
+                neighbors.extend(self.filter_widget.image_keys(info, self.it_dir, self.raw_dir))
+
+            # Up / Down で移動する先の表示範囲
+            for offset in (-1, 1):
+                info = self.filter_infos[(self.filter_index + offset) % len(self.filter_infos)]
+                add_frames(self.position_of(info))
+
+        # さらに外側は低解像度のRAW画像だけを先読みする（押し続けて移動したときに、読み込み中の代わりに表示する）
+        preview = PREVIEW_RANGE * self.prefetch
+        for index in range(self.info_index - self.frames + 1 - preview, self.info_index + preview + 1):
             if 0 <= index < len(self.current_infos):
-                self.park_widgets[i].set_info(self.current_infos, index, self.it_dir, self.raw_dir)
-            # else:
-                # self.park_widgets[i].set_empty()
-                # print('Wrong Index:' + str(index))
+                neighbors.extend(self.filter_widget.image_keys(self.current_infos[index], self.it_dir, self.raw_dir))
+
+        get_image_loader().prefetch(visible, neighbors)
+
+    def image_labels(self):
+        labels = [self.filter_widget.raw_label]
+        for park_widget in self.park_widgets:
+            labels += [park_widget.plate_label, park_widget.vehicle_label, park_widget.raw_label]
+        return labels
 
     def save(self):
         if not self.path:
             return
+
+        if self.loading or self.load_partial:
+            # 読み込んでいないフレームのラベルが label.csv から消えるため保存しない
+            self.statusBar().showMessage('Cannot save while loading or after the load was stopped. Load the folder again.')
+            return
         
         label_path = save_label(self.path, self.infos)
         
-        path, eval_results = save_eval(self.path, self.lots, self.infos)
+        path, eval_results = save_eval(self.path, self.lots, self.infos, self.eval_accumulator.results())
         self.statusBar().showMessage(f'Saved label: {label_path}, Saved eval: {path}')
 
         self.update_eval_table(eval_results)
@@ -384,6 +731,9 @@ class MainWidget(QMainWindow):
         self.eval_movement()
         self.update_views()
 
+        if self.tabs.currentIndex() == 1:
+            self.update_eval_table()
+
     def eval_movement(self):
         for lot in self.lots:
             wrong_out_happened = False
@@ -410,7 +760,9 @@ class MainWidget(QMainWindow):
 
     def update_eval_table(self, eval_results=None):
         if eval_results == None:
-            eval_results = eval(self.lots, self.infos)
+            if self.eval_accumulator is None:
+                return
+            eval_results = self.eval_accumulator.results()
 
         for i, (k, (all_val, first_val)) in enumerate(eval_results.items()):
             self.eval_view.setItem(i, 0, QTableWidgetItem(k))
@@ -428,21 +780,44 @@ class MainWidget(QMainWindow):
     def on_show_status_changed(self, state):
         for park_widget in self.park_widgets:
             park_widget.raw_label.set_status_visible(state == Qt.CheckState.Checked.value)
-        self.update_views()
 
     def on_show_plate_changed(self, state):
         for park_widget in self.park_widgets:
             park_widget.raw_label.set_plate_visible(state == Qt.CheckState.Checked.value)
-        self.update_views()
 
     def on_show_vehicle_changed(self, state):
         for park_widget in self.park_widgets:
             park_widget.raw_label.set_vehicle_visible(state == Qt.CheckState.Checked.value)
-        self.update_views()
 
     def on_tabbar_clicked(self, index):
         if index == 1:
             self.update_eval_table()
+        if self.tabs.widget(index) is self.review_widget:
+            self.update_review()
+            self.review_widget.view.setFocus()
+        if self.tabs.widget(index) is self.table_widget and self.infos and not self.loading:
+            self.table_widget.set_store(self.store)
+            self.table_widget.view.setFocus()
+
+    def update_review(self):
+        """review タブにフィルタ結果（フィルタ無しの場合は表示中の全フレーム）を表示する（タブを開いている時のみ）"""
+        if self.tabs.currentWidget() is not self.review_widget or not self.infos or self.loading:
+            return
+        infos = self.filter_infos if len(self.filter_infos) > 0 else self.current_infos
+        self.review_widget.set_infos(infos, self.raw_dir)
+
+    def jump_to(self, info: ParkingInfo):
+        """review / table タブで選んだフレームを labeling タブで表示する"""
+        if self.loading:
+            return
+        if self.position_of(info) < 0:
+            self.statusBar().showMessage(f'Not in the current view (Lot / Moving / Stop / None): {info.json_file}')
+            return
+        if len(self.filter_infos) > 0:
+            self.filter_index = next((i for i, filter_info in enumerate(self.filter_infos) if filter_info.index == info.index), self.filter_index)
+        self.info_index = self.position_of(info)
+        self.tabs.setCurrentIndex(0)
+        self.update_views()
 
     def configure_shortcuts(self):
         shortcut = QShortcut(QKeySequence("Ctrl+C"), self)
@@ -8,6 +8,7 @@ from PyQt6.QtCore import Qt
 
 
 from app.views.image_label import ClickableImageLabel
+from app.views.image_loader import image_key
 from app.views.json_widget import JsonWindow
 from app.models.parking_info import ParkingInfo
 from app.types import Status, text_for
@@ -219,7 +220,7 @@ class ParkWidget(QWidget):
         if self.info is None:
             return
         # 新しいウィンドウを生成して表示
-        self.json_window = JsonWindow(self.info.json_data)
+        self.json_window = JsonWindow(self.info.load_json())
         self.json_window.show()
 
     def on_time_clicked(self):
@@ -240,19 +241,27 @@ class ParkWidget(QWidget):
             text = str(self.info.lpr_top) + '\n' + str(self.info.lpr_bottom)
             clipboard.setText(text)
 
+    def image_paths(self, info: ParkingInfo, it_dir: str, raw_dir: str):
+        return (
+            os.path.join(it_dir, info.name() + '_plate.bmp'),
+            os.path.join(it_dir, info.name() + '_vehicle.jpg'),
+            os.path.join(raw_dir, info.name() + '_raw.jpg'),
+        )
+
+    def image_keys(self, info: ParkingInfo, it_dir: str, raw_dir: str) -> list[tuple]:
+        """info の画像の ImageLoader のキー（先読み用）"""
+        labels = (self.plate_label, self.vehicle_label, self.raw_label)
+        return [image_key(path, label.scale) for path, label in zip(self.image_paths(info, it_dir, raw_dir), labels)]
+
     def set_info(self, infos: list[ParkingInfo], index: int, it_dir: str, raw_dir: str):
         info = infos[index]
         self.info = info
 
         # Update images
-        path = os.path.join(it_dir, info.name() + '_plate.bmp')
-        self.plate_label.set(path, info)
-
-        path = os.path.join(it_dir, info.name() + '_vehicle.jpg')
-        self.vehicle_label.set(path, info)
-
-        path = os.path.join(raw_dir, info.name() + '_raw.jpg')
-        self.raw_label.set(path, info)
+        plate_path, vehicle_path, raw_path = self.image_paths(info, it_dir, raw_dir)
+        self.plate_label.set(plate_path, info)
+        self.vehicle_label.set(vehicle_path, info)
+        self.raw_label.set(raw_path, info)
 
 
         # Update info label
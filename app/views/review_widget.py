@@ -0,0 +1,192 @@
+import os
+
+import numpy as np
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QPoint, QSize, pyqtSignal
+
+from app.types import Status, text_for
+from app.models.parking_info import ParkingInfo
+from app.views.image_loader import get_image_loader, image_key
+from app.views.key_bindings import key_status_map
+
+
+class ReviewModel(QAbstractListModel):
+    """フィルタ結果の ParkingInfo の一覧（画像は ImageLoader のキャッシュにあるものだけを返す）"""
+
+    SCALE = 10
+    CELL_SIZE = QSize(220, 200)
+
+    def __init__(self):
+        super().__init__()
+        self.infos: list[ParkingInfo] = []
+        self.raw_dir = ''
+
+    def set_infos(self, infos: list[ParkingInfo], raw_dir: str):
+        self.beginResetModel()
+        self.infos = infos
+        self.raw_dir = raw_dir
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.infos)
+
+    def image_path(self, row: int) -> str:
+        return os.path.join(self.raw_dir, self.infos[row].name() + '_raw.jpg')
+
+    def image_key(self, row: int) -> tuple:
+        return image_key(self.image_path(row), self.SCALE)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        info = self.infos[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f'{row + 1} (Lot: {info.lot})\n{text_for(info.status)}'
+        if role == Qt.ItemDataRole.DecorationRole:
+            return get_image_loader().peek(self.image_key(row))
+        if role == Qt.ItemDataRole.SizeHintRole:
+            # 画像の読み込み前も同じ大きさにする（クリックできる範囲をセル全体にする）
+            return self.CELL_SIZE - QSize(10, 10)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f'{info.json_file}\ntop: {info.lpr_top}\nbottom: {info.lpr_bottom}'
+        return None
+
+
+class ReviewView(QListView):
+    """ステータスのキーを status_pressed で通知し、それ以外のキー（移動・選択）は QListView で処理する"""
+
+    status_pressed = pyqtSignal(object)
+
+    def keyPressEvent(self, event):
+        if event.key() in key_status_map:
+            self.status_pressed.emit(key_status_map[event.key()])
+            return
+        super().keyPressEvent(event)
+
+
+class ReviewWidget(QWidget):
+    """フィルタ結果をサムネイルの一覧で確認する review タブ
+
+    QListView は表示中のセルだけ data() を呼ぶので、画像の読み込みも表示中（と前後1画面分）のセルに限る。
+    画像は ImageLoader の共有キャッシュに置き、このウィジェットでは保持しない。
+    ダブルクリック / Enter で labeling タブのそのフレームに移動する。
+    """
+
+    # labeling タブで開くフレーム
+    jump_requested = pyqtSignal(object)
+    # 選択中のセルにステータスを付けた
+    status_assigned = pyqtSignal()
+
+    CELL_SIZE = ReviewModel.CELL_SIZE
+
+    def __init__(self):
+        super().__init__()
+
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.model = ReviewModel()
+
+        self.view = ReviewView()
+        self.view.setModel(self.model)
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setMovement(QListView.Movement.Static)
+        self.view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.view.setUniformItemSizes(True)
+        self.view.setGridSize(self.CELL_SIZE)
+        self.view.setIconSize(QSize(self.CELL_SIZE.width() - 20, self.CELL_SIZE.height() - 50))
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.view.status_pressed.connect(self.assign_status)
+        self.view.activated.connect(lambda index: self.jump_requested.emit(self.model.infos[index.row()]))
+        self.view.verticalScrollBar().valueChanged.connect(self.request_visible)
+        layout.addWidget(self.view)
+
+        # 読み込みを依頼した画像のキー -> 行
+        self.requested: dict[tuple, int] = {}
+        get_image_loader().loaded.connect(self.on_loaded)
+
+    def set_infos(self, infos: list[ParkingInfo], raw_dir: str):
+        # 同じ一覧なら選択とスクロール位置を残す
+        if infos is self.model.infos and raw_dir == self.model.raw_dir:
+            self.view.viewport().update()
+            return
+
+        self.model.set_infos(infos, raw_dir)
+        self.view.scrollToTop()
+        self.update_summary()
+        self.request_visible()
+
+    def update_summary(self):
+        infos = self.model.infos
+        counts = np.zeros(len(Status), dtype=np.int64)
+        if infos:
+            indices = np.fromiter((info.index for info in infos), dtype=np.int64, count=len(infos))
+            counts = np.bincount(infos[0].store.columns['status'][indices].astype(np.int64), minlength=len(Status))
+        text = ', '.join(f'{text_for(status) or "NoLabel"}: {counts[status.value]}' for status in Status if counts[status.value] > 0)
+        self.summary_label.setText(f'{len(self.model.infos)} frames  {text}')
+
+    def visible_rows(self) -> range:
+        """表示中のセルの行の範囲（セルは CELL_SIZE の格子に左上から並ぶ）"""
+        count = self.model.rowCount()
+        viewport = self.view.viewport().rect()
+        columns = max(1, viewport.width() // self.CELL_SIZE.width())
+        top = self.view.verticalScrollBar().value()
+        first = top // self.CELL_SIZE.height()
+        last = (top + viewport.height() - 1) // self.CELL_SIZE.height()
+        return range(min(count, first * columns), min(count, (last + 1) * columns))
+
+    def request_visible(self):
+        """表示中のセルの画像を読み込み、前後1画面分を先読みする（それ以外の予約は取り消す）"""
+        rows = self.visible_rows()
+        page = len(rows)
+        visible = list(rows)
+        neighbors = [row for row in range(max(0, rows.start - page), min(self.model.rowCount(), rows.stop + page)) if row not in rows]
+
+        loader = get_image_loader()
+        self.requested = {}
+        keys = {}
+        for row in visible + neighbors:
+            if loader.exists(self.model.image_path(row)):
+                key = self.model.image_key(row)
+                keys[row] = key
+                self.requested[key] = row
+
+        loader.prefetch([keys[row] for row in visible if row in keys], [keys[row] for row in neighbors if row in keys], client='review')
+
+    def on_loaded(self, key: tuple):
+        row = self.requested.get(key)
+        if row is not None and row < self.model.rowCount():
+            index = self.model.index(row)
+            self.model.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def assign_status(self, status: Status):
+        rows = sorted(index.row() for index in self.view.selectionModel().selectedIndexes())
+        if not rows:
+            return
+
+        for row in rows:
+            self.model.infos[row].set(status)
+
+        self.model.dataChanged.emit(self.model.index(rows[0]), self.model.index(rows[-1]), [Qt.ItemDataRole.DisplayRole])
+        self.update_summary()
+        self.status_assigned.emit()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.request_visible()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.request_visible()
+
+    def hideEvent(self, event):
+        # 他のタブに切り替えたら、読み込み前の画像の予約を取り消す
+        super().hideEvent(event)
+        self.requested = {}
+        get_image_loader().prefetch([], [], client='review')
@@ -0,0 +1,168 @@
+import numpy as np
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from app.types import text_for
+from app.models.parking_info import ParkingInfo
+
+
+class RecordTableModel(QAbstractTableModel):
+    """RecordStore の全レコードを表形式で返す（表示するセルだけを文字列にする）
+
+    並べ替えは列ごとにレコード番号の並び（argsort）を作って保持し、同じ列の並べ替えでは作り直さない。
+    None（空欄）は昇順で先頭に並ぶ。
+    """
+
+    NUMERIC_KINDS = ('float',)
+
+    def __init__(self):
+        super().__init__()
+        self.store = None
+        self.names = list(ParkingInfo.columns().keys())
+
+        # 表示順 -> レコード番号、レコード番号 -> 表示順
+        self.order = np.empty(0, dtype=np.int64)
+        self.positions = np.empty(0, dtype=np.int64)
+
+        # 列名 -> 昇順に並べたレコード番号
+        self.sort_indices: dict[str, np.ndarray] = {}
+
+    def set_store(self, store):
+        self.beginResetModel()
+        self.close()
+        self.store = store
+        store.listeners.append(self.on_changed)
+        self.sort_indices = {}
+        self.set_order(np.arange(len(store)))
+        self.endResetModel()
+
+    def close(self):
+        if self.store is not None and self.on_changed in self.store.listeners:
+            self.store.listeners.remove(self.on_changed)
+
+    def set_order(self, order: np.ndarray):
+        self.order = order
+        self.positions = np.empty(len(order), dtype=np.int64)
+        self.positions[order] = np.arange(len(order))
+
+    def info(self, row: int) -> ParkingInfo:
+        return self.store.views()[self.order[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.names[section]
+        # 読み込み順のレコード番号
+        return str(self.order[section] + 1)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        # 描画のたびにセルごと・ロールごとに呼ばれるので、使わないロールはすぐに返す
+        if role == Qt.ItemDataRole.DisplayRole:
+            name = self.names[index.column()]
+            return self.format(name, self.store.get(name, self.order[index.row()]))
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.store.kinds[self.names[index.column()]] in self.NUMERIC_KINDS:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def format(self, name: str, value) -> str:
+        if value is None:
+            return ''
+        kind = self.store.kinds[name]
+        if kind == 'status':
+            return text_for(value)
+        if kind == 'index':
+            return value.json_file
+        if isinstance(value, float):
+            return f'{value:.4f}'.rstrip('0').rstrip('.')
+        return str(value)
+
+    def sort_index(self, name: str) -> np.ndarray:
+        """name 列の昇順に並べたレコード番号（初回のみ計算する）"""
+        if name not in self.sort_indices:
+            store = self.store
+            column = store.columns[name]
+            kind = store.kinds[name]
+            if kind == 'str':
+                # 列に含まれる文字列だけを並べて順位を付ける（None = 0 は先頭）
+                present = np.zeros(len(store.strings), dtype=bool)
+                present[column] = True
+                present[0] = False
+                string_ids = sorted(np.flatnonzero(present).tolist(), key=store.strings.__getitem__)
+                ranks = np.zeros(len(store.strings), dtype=np.int64)
+                ranks[string_ids] = np.arange(1, len(string_ids) + 1)
+                key = ranks[column]
+            elif kind == 'float':
+                key = np.where(np.isnan(column), -np.inf, column)
+            else:
+                key = column
+            self.sort_indices[name] = np.argsort(key, kind='stable')
+        return self.sort_indices[name]
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        if self.store is None:
+            return
+
+        self.beginResetModel()
+        if column < 0:
+            self.set_order(np.arange(len(self.store)))
+        else:
+            indices = self.sort_index(self.names[column])
+            self.set_order(indices if order == Qt.SortOrder.AscendingOrder else indices[::-1])
+        self.endResetModel()
+
+    def on_changed(self, name: str, index: int, old):
+        # 値が変わった列の並びは次の並べ替えで作り直す（表示中の並び順はそのまま）
+        self.sort_indices.pop(name, None)
+        if name in ParkingInfo.DERIVED_SOURCES:
+            for derived in ParkingInfo.DERIVED:
+                self.sort_indices.pop(derived, None)
+
+        if index < len(self.positions):
+            row = int(self.positions[index])
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.names) - 1))
+
+
+class TableWidget(QWidget):
+    """全レコードを表で表示する table タブ（ヘッダのクリックで並べ替え、ダブルクリック / Enter で labeling タブに移動）"""
+
+    # labeling タブで開くフレーム
+    jump_requested = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+
+        layout = QVBoxLayout(self)
+
+        self.model = RecordTableModel()
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setWordWrap(False)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        # 列幅は先頭の数十行から決める
+        self.view.horizontalHeader().setResizeContentsPrecision(50)
+        # 読み込み順で表示する（setSortingEnabled は現在のソート列で並べ替えるため先に解除しておく）
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.view.setSortingEnabled(True)
+        self.view.activated.connect(lambda index: self.jump_requested.emit(self.model.info(index.row())))
+        layout.addWidget(self.view)
+
+    def set_store(self, store):
+        # 同じデータなら並び順とスクロール位置を残す（読み込み中に行が増えた場合は作り直す）
+        if store is self.model.store and len(store) == len(self.model.order):
+            self.view.viewport().update()
+            return
+
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.model.set_store(store)
+        self.view.resizeColumnsToContents()
@@ -0,0 +1,151 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+CACHE_DIR = os.path.join('.park_eval_cache', 'thumbnails')
+
+# 縮小画像を作る画像（ファイル名の末尾 -> 縮小率）: ParkWidget / FilterWidget の表示サイズ
+THUMBNAIL_SCALES = {
+    '_raw.jpg': (5, 10),
+    '_vehicle.jpg': (4,),
+}
+
+THUMBNAIL_QUALITY = 90
+
+
+class ThumbnailCache:
+    """データフォルダ内に、RAW/IT画像の表示サイズの縮小画像を保存する
+
+    縮小画像のファイル名には元画像の mtime を含めるため、元画像が更新されると使われなくなる。
+    縮小画像の有無は縮小率ごとのフォルダの一覧（作成時に1回だけ os.scandir する）から判定する。
+    元画像の mtime は、縮小画像を作る画像だけ、読み込みのスレッドで最初に使うときに stat して保持する。
+    一覧の取得に時間がかかるため、GUI では LoadWorker のスレッドで作る。
+    """
+
+    def __init__(self, path: str):
+        self.dir = os.path.join(path, CACHE_DIR)
+
+        # 元画像のパス -> mtime（ns）
+        self.mtimes: dict[str, int] = {}
+
+        # 縮小率 -> 作成済みの縮小画像のファイル名（作成時に追加する）
+        self.names: dict[int, set[str]] = {}
+        for scale in sorted({scale for scales in THUMBNAIL_SCALES.values() for scale in scales}):
+            try:
+                self.names[scale] = {entry.name for entry in os.scandir(os.path.join(self.dir, str(scale)))}
+            except OSError:
+                self.names[scale] = set()
+
+    @staticmethod
+    def available(path: str) -> bool:
+        """データフォルダに縮小画像のフォルダがあるか"""
+        return os.path.isdir(os.path.join(path, CACHE_DIR))
+
+    def thumbnail_name(self, source: str, mtime_ns: int) -> str:
+        return f'{os.path.basename(source)}.{mtime_ns}.jpg'
+
+    def thumbnail_path(self, source: str, scale: int, mtime_ns: int) -> str:
+        return os.path.join(self.dir, str(scale), self.thumbnail_name(source, mtime_ns))
+
+    def contains(self, source: str, scale: int, mtime_ns: int) -> bool:
+        return self.thumbnail_name(source, mtime_ns) in self.names.get(scale, ())
+
+    def add(self, source: str, scale: int, mtime_ns: int):
+        self.names.setdefault(scale, set()).add(self.thumbnail_name(source, mtime_ns))
+
+    def lookup(self, source: str, scale: int) -> str:
+        """縮小画像があればそのパスを返す（無ければNone）"""
+        if not any(source.endswith(suffix) and scale in scales for suffix, scales in THUMBNAIL_SCALES.items()):
+            return None
+
+        mtime_ns = self.mtimes.get(source)
+        if mtime_ns is None:
+            try:
+                mtime_ns = self.mtimes[source] = os.stat(source).st_mtime_ns
+            except OSError:
+                return None
+
+        if not self.contains(source, scale, mtime_ns):
+            return None
+        return self.thumbnail_path(source, scale, mtime_ns)
+
+
+class ThumbnailBuilder(threading.Thread):
+    """縮小画像をバックグラウンドで作る（作成済みのものは飛ばすので、中断しても続きから作れる）
+
+    workers 個のスレッドで並列に作る（既定はCPU数の1/4、表示のための読み込みを妨げないように少なめ）。
+    """
+
+    def __init__(self, cache: ThumbnailCache, image_dirs: list[str], workers: int = 0):
+        super().__init__(daemon=True)
+        self.cache = cache
+        self.image_dirs = image_dirs
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 1) // 4)
+        self.stop_event = threading.Event()
+
+        self.built = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def stop(self):
+        self.stop_event.set()
+
+    def jobs(self):
+        for image_dir in self.image_dirs:
+            if not os.path.isdir(image_dir):
+                continue
+
+            for entry in sorted(os.scandir(image_dir), key=lambda entry: entry.name):
+                for suffix, scales in THUMBNAIL_SCALES.items():
+                    if entry.name.endswith(suffix):
+                        mtime_ns = entry.stat().st_mtime_ns
+                        for scale in scales:
+                            yield entry.path, scale, mtime_ns
+
+    def build(self, job):
+        # 循環 import を避けるためここで読み込む
+        from app.views.image_loader import decode_image
+
+        if self.stop_event.is_set():
+            return
+
+        source, scale, mtime_ns = job
+        if self.cache.contains(source, scale, mtime_ns):
+            self.skipped += 1
+            return
+        path = self.cache.thumbnail_path(source, scale, mtime_ns)
+
+        image = decode_image((source, scale, None))
+        if image.isNull():
+            self.failed += 1
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.jpg'
+        if image.save(tmp_path, 'JPG', THUMBNAIL_QUALITY):
+            os.replace(tmp_path, path)
+            self.cache.add(source, scale, mtime_ns)
+            self.built += 1
+        else:
+            self.failed += 1
+
+    def run(self):
+        # フォルダの一覧は少しずつ読み、実行中・待機中のジョブは workers の2倍までにする（stop() ですぐに止まるように）
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = set()
+                for job in self.jobs():
+                    if self.stop_event.is_set():
+                        break
+                    if len(futures) >= 2 * self.workers:
+                        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    futures.add(executor.submit(self.build, job))
+                for future in wait(futures).done:
+                    future.result()
+        except OSError as e:
+            print('[thumbnails] Failed:', e)
+
+        state = 'Stopped' if self.stop_event.is_set() else 'Done'
+        print(f'[thumbnails] {state}. Built: {self.built}, Skipped: {self.skipped}, Failed: {self.failed}')
@@ -8,10 +8,12 @@ from PyQt6.QtGui import QAction, QKeySequence, QShortcut, QGuiApplication, QKeyE
 
 from PyQt6.QtWidgets import QApplication
            
-from app.controllers.data_manager import load
+from app.controllers.data_manager import load, iter_label_rows
 from app.views.image_label import ClickableImageLabel
+from app.views.image_loader import get_image_loader
 from app.types import Status, text_for
 from app.models.parking_info import ParkingInfo
+from app.models.asset_index import AssetIndex
 from app.utlis import parse_timestamp, format_jst, diff_timestamp
 
 class EBSIMWidget(QMainWindow):
@@ -133,6 +135,9 @@ class EBSIMWidget(QMainWindow):
         self.tb_only = tb_only
         self.infos = infos
 
+        # isp/ のファイル一覧（画像の有無の判定に使う）
+        get_image_loader().assets = AssetIndex(path)
+
         self.wrong_top_infos = []
         self.wrong_bottom_infos = []
 
@@ -146,44 +151,37 @@ class EBSIMWidget(QMainWindow):
         # Load ebsim label csv
         ebsim_label_csv = os.path.join(path, 'ebsim_label.csv')
         if os.path.exists(ebsim_label_csv):
-            with open(ebsim_label_csv, newline='', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                # header = next(reader)
-                for row in reader:
-                    match = [info for info in infos if info.json_file == row['json']]
-                    if len(match) == 1:
-                        if self.tb_only:
-                            if 'top_correct' in row:
-                                if row['top_correct'] == '0':
-                                    self.wrong_top_infos.append(match[0])
-
-                            if 'bottom_correct' in row:
-                                if row['bottom_correct'] == '0':
-                                    self.wrong_bottom_infos.append(match[0])
-                        else:
-                            if 'Prefecture_correct' in row:
-                                if row['Prefecture_correct'] == '0':
-                                    self.wrong_prefecture_infos.append(match[0])
-
-                            if 'ClassificationNumber_correct' in row:
-                                if row['ClassificationNumber_correct'] == '0':
-                                    self.wrong_classificationnumber_infos.append(match[0])
-
-                            if 'hiragana_correct' in row:
-                                if row['hiragana_correct'] == '0':
-                                    self.wrong_hiragana_infos.append(match[0])
-
-                            if 'LPNumber_correct' in row:
-                                if row['LPNumber_correct'] == '0':
-                                    self.wrong_lpnumber_infos.append(match[0])
-                            
-                        if 'is_first' in row:
-                            match[0].is_first = bool(int(row['is_first']))
-
-                        if 'status' in row:
-                            match[0].status = Status(int(row['status']))
-                    else:
-                        print(row['json'])
+            for info, row in iter_label_rows(ebsim_label_csv, infos):
+                if self.tb_only:
+                    if 'top_correct' in row:
+                        if row['top_correct'] == '0':
+                            self.wrong_top_infos.append(info)
+
+                    if 'bottom_correct' in row:
+                        if row['bottom_correct'] == '0':
+                            self.wrong_bottom_infos.append(info)
+                else:
+                    if 'Prefecture_correct' in row:
+                        if row['Prefecture_correct'] == '0':
+                            self.wrong_prefecture_infos.append(info)
+
+                    if 'ClassificationNumber_correct' in row:
+                        if row['ClassificationNumber_correct'] == '0':
+                            self.wrong_classificationnumber_infos.append(info)
+
+                    if 'hiragana_correct' in row:
+                        if row['hiragana_correct'] == '0':
+                            self.wrong_hiragana_infos.append(info)
+
+                    if 'LPNumber_correct' in row:
+                        if row['LPNumber_correct'] == '0':
+                            self.wrong_lpnumber_infos.append(info)
+
+                if 'is_first' in row:
+                    info.is_first = bool(int(row['is_first']))
+
+                if 'status' in row:
+                    info.status = Status(int(row['status']))
         
         
         self.update_view()
@@ -332,6 +330,9 @@ class EBSIMWidget(QMainWindow):
 
         self.plate_label.set(image_path, info, rect=QRect(info.plate_xmin, info.plate_ymin, info.plate_xmax - info.plate_xmin, info.plate_ymax - info.plate_ymin))
 
+        # 表示中の画像だけを読み込み対象にする（前のフレームの読み込み待ちは取り消す）
+        get_image_loader().prefetch([label.key for label in (self.raw_label, self.plate_label) if label.key is not None], [])
+
         self.is_first.setChecked(info.is_first)
 
         if self.tb_only:
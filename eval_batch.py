@@ -0,0 +1,16 @@
+import argparse
+
+from app.controllers.batch_eval import run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="evaluate every capture folder under root without the GUI")
+    parser.add_argument("root", help="root folder that contains capture folders (folders with META)")
+    parser.add_argument("--workers", type=int, default=0, help="number of worker processes (0: number of CPUs, 1: no pool)")
+    parser.add_argument("--force", action="store_true", help="evaluate every folder even if its inputs are unchanged")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the parsed META cache in each folder")
+    parser.add_argument("--verbose", action="store_true", help="print the loading log of each folder")
+
+    args = parser.parse_args()
+
+    run(args.root, workers=args.workers, use_cache=not args.no_cache, force=args.force, verbose=args.verbose)
@@ -1,16 +1,40 @@
 import sys
+import argparse
 
 from PyQt6.QtWidgets import QApplication
 
 from app.views.main_widget import MainWidget
+from app.models.parking_info import json_cache
+from app.views import image_loader
            
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", default=None, help="path to data")
+    parser.add_argument("--frames", type=int, default=3, help="number of consecutive frames shown side by side in the labeling tab")
+    parser.add_argument("--workers", type=int, default=0, help="number of worker processes for loading META json")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the parsed META cache")
+    parser.add_argument("--keep-json", action="store_true", help="keep every META json in memory instead of re-reading it for the JSON viewer")
+    parser.add_argument("--check-eval", action="store_true", help="verify the incremental eval against a full recount on every refresh")
+    parser.add_argument("--prefetch", type=int, default=3, help="number of frames before/after the view whose images are decoded in the background")
+    parser.add_argument("--image-cache-mb", type=float, default=512, help="memory budget of the decoded image cache in MB")
+    parser.add_argument("--build-thumbnails", action="store_true", help="build downscaled RAW/vehicle images in the data folder in the background")
+    parser.add_argument("--thumbnail-workers", type=int, default=0, help="number of threads for building thumbnails (0: a quarter of the CPUs)")
+    parser.add_argument("--json-cache-size", type=int, default=8, help="number of recently opened META json kept for the JSON viewer")
+
+    args = parser.parse_args()
+
     app = QApplication(sys.argv)
     # app.setStyleSheet("QWidget { font-size: 24pt; }")
 
-    window = MainWidget(3)
-    if len(sys.argv) == 2:
-        window.load(sys.argv[1])
+    json_cache.maxsize = args.json_cache_size
+    image_loader.image_cache_mb = args.image_cache_mb
+
+    window = MainWidget(args.frames, workers=args.workers, use_cache=not args.no_cache, keep_json=args.keep_json, check_eval=args.check_eval, prefetch=args.prefetch, build_thumbnails=args.build_thumbnails, thumbnail_workers=args.thumbnail_workers)
+    if args.path:
+        window.load(args.path)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    code = app.exec()
+
+    print('[image cache]', image_loader.get_image_loader().cache.stats())
+    sys.exit(code)
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from app.controllers.data_manager import NG_STATUSES, eval, eval_counts, eval_results
+from app.controllers.eval_accumulator import EvalAccumulator
+from app.models.record_store import RecordStore
+from app.types import Status
+
+LOTS = ('00', '01', '02')
+FLAGS = ('is_miss_in', 'is_miss_out', 'is_gt_unknown', 'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot')
+
+
+def make_infos(rng: random.Random, count: int):
+    """ランダムなレコード（lot / Vehicle_Status / Is_Occupied / ラベル）の ParkingInfo を作る"""
+    rows = []
+    for i in range(count):
+        row = {
+            'lot': rng.choice(LOTS),
+            'timestamp': f'20250910{i:09d}',
+            'vehicle_status': rng.choice(('Stop', 'Moving', None)),
+            'is_occupied': rng.choice((True, True, False, None)),
+            'status': rng.choice(list(Status)),
+            'is_first': rng.random() < 0.5,
+        }
+        for name in FLAGS:
+            row[name] = rng.random() < 0.2
+        rows.append(row)
+
+    store = RecordStore()
+    store.extend(rows)
+    return store.views()
+
+
+def reference_counts(lots, infos):
+    """eval_counts と同じ件数を、レコードごとのループで数える（ベクトル化前の eval と同じ手順）"""
+    counts = {name: 0 for name in eval_counts(lots, [])}
+    unknown = []
+    is_occupied_last = False
+
+    infos_wo_moving = [info for info in infos if info.vehicle_status != 'Moving']
+    for lot in lots:
+        for info in infos_wo_moving:
+            if info.lot != lot:
+                continue
+
+            if info.status == Status.Wrong_Out:
+                counts['wrong_out'] += 1
+                counts['wrong_out_f'] += info.is_first
+            for name in ('is_miss_in', 'is_miss_out', 'is_wrong_in_by_fp', 'is_wrong_in_by_side_lot'):
+                counts[name] += getattr(info, name)
+
+            if info.is_occupied:
+                counts['detect_all'] += 1
+                counts['detect_all_f'] += info.is_first
+                counts['resend'] += is_occupied_last
+                counts['is_gt_unknown'] += info.is_gt_unknown
+
+                names = [name for name, status in NG_STATUSES.items() if info.status == status]
+                if info.status == Status.OK:
+                    names = ['detect_ok']
+                elif not names:
+                    unknown.append(info)
+                for name in names:
+                    counts[name] += 1
+                    counts[name + '_f'] += info.is_first
+
+            is_occupied_last = bool(info.is_occupied)
+
+    return counts, unknown
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_eval_counts_matches_loop(seed):
+    rng = random.Random(seed)
+    infos = make_infos(rng, 300)
+
+    # 全件（store.views() そのもの）と、一部のレコード・lotに絞った場合
+    for lots, subset in ((list(LOTS), infos), (rng.sample(LOTS + ('99',), 2), [info for info in infos if rng.random() < 0.7])):
+        expected, _ = reference_counts(lots, subset)
+        assert eval_counts(lots, subset, report_unknown=False) == expected
+
+
+def test_eval_matches_loop_results():
+    infos = make_infos(random.Random(100), 500)
+    expected, _ = reference_counts(list(LOTS), infos)
+    assert eval(list(LOTS), infos) == eval_results(expected)
+
+
+def test_eval_counts_reports_unknown_status(capsys):
+    infos = make_infos(random.Random(200), 300)
+    _, unknown = reference_counts(list(LOTS), infos)
+    assert unknown
+
+    eval_counts(list(LOTS), infos)
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted(f'Unknown status: {info.lot} {info.timestamp}' for info in unknown)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_accumulator_matches_full_eval_after_edits(seed, capsys):
+    rng = random.Random(seed)
+    infos = make_infos(rng, 200)
+    lots = list(LOTS[:2])
+
+    accumulator = EvalAccumulator(lots, infos, self_check=True)
+    try:
+        for step in range(500):
+            info = rng.choice(infos)
+            edit = rng.randrange(3)
+            if edit == 0:
+                info.status = rng.choice(list(Status))
+            elif edit == 1:
+                info.is_first = rng.random() < 0.5
+            else:
+                setattr(info, rng.choice(FLAGS), rng.random() < 0.5)
+
+            assert accumulator.counts == eval_counts(lots, infos, report_unknown=False), step
+
+        assert accumulator.results() == eval(lots, infos)
+        assert '[eval] Incremental result mismatch' not in capsys.readouterr().out
+    finally:
+        accumulator.close()
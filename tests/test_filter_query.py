@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.models.filter_index import FilterIndex
+from app.models.filter_query import FilterQuery, QueryError
+from app.models.record_store import RecordStore
+from app.types import Status
+
+ROWS = [
+    {'lot': '00', 'timestamp': '20250910000001', 'vehicle_status': 'Stop', 'is_occupied': True, 'plate_confidence': 0.2, 'plate_xmin': 10, 'status': Status.OK, 'is_first': True},
+    {'lot': '00', 'timestamp': '20250910000002', 'vehicle_status': 'Moving', 'is_occupied': False, 'plate_confidence': 0.9, 'plate_xmin': 10.5, 'status': Status.NG_Blur},
+    {'lot': '00', 'timestamp': '20250910000003', 'vehicle_status': None, 'is_occupied': None, 'plate_confidence': None, 'plate_xmin': None, 'status': Status.NoLabel},
+    {'lot': '01', 'timestamp': '20250910000004', 'vehicle_status': 'Stop', 'is_occupied': True, 'plate_confidence': 0.5, 'plate_xmin': 20, 'status': Status.NG_Out, 'is_first': True},
+    {'lot': '01', 'timestamp': '20250910000005', 'vehicle_status': 'Moving', 'is_occupied': None, 'plate_confidence': 0.1, 'plate_xmin': None, 'status': Status.OK},
+    {'lot': '10', 'timestamp': '20250910000006', 'vehicle_status': 'Stop', 'is_occupied': False, 'plate_confidence': None, 'plate_xmin': 5, 'status': Status.Wrong_Out},
+]
+
+
+@pytest.fixture(scope='module')
+def masks():
+    store = RecordStore()
+    store.extend(ROWS)
+    return FilterIndex(store)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('lot=="00"', [0, 1, 2]),
+    ('lot==00', [0, 1, 2]),
+    ('lot==10', [5]),
+    ('lot!=00', [3, 4, 5]),
+    ('lot in (00, "01")', [0, 1, 2, 3, 4]),
+    ('lot not in (00, 01)', [5]),
+    ('lot<"01"', [0, 1, 2]),
+    ('vehicle_status==None', [2]),
+    ('vehicle_status!=None', [0, 1, 3, 4, 5]),
+    ('vehicle_status!="Stop"', [1, 2, 4]),
+    ('timestamp>="20250910000005"', [4, 5]),
+    # float: None（NaN）は値との比較で常に不一致
+    ('plate_confidence<0.4', [0, 4]),
+    ('plate_confidence>=0.5', [1, 3]),
+    ('plate_confidence==None', [2, 5]),
+    ('plate_confidence!=None', [0, 1, 3, 4]),
+    ('plate_confidence!=0.2', [1, 3, 4]),
+    ('plate_xmin==10', [0]),
+    ('plate_xmin==10.5', [1]),
+    ('plate_xmin>=10', [0, 1, 3]),
+    ('plate_xmin!=10', [1, 3, 5]),
+    # bool3: None は True / False のどちらとも一致しない
+    ('is_occupied', [0, 3]),
+    ('not is_occupied', [1, 2, 4, 5]),
+    ('is_occupied==True', [0, 3]),
+    ('is_occupied==False', [1, 5]),
+    ('is_occupied==None', [2, 4]),
+    ('is_occupied!=True', [1, 5]),
+    ('is_occupied!=None', [0, 1, 3, 5]),
+    ('is_first', [0, 3]),
+    ('is_first==False', [1, 2, 4, 5]),
+    ('status==OK', [0, 4]),
+    ('status!=OK', [1, 2, 3, 5]),
+    ('status in (NG_Blur, NG_Out)', [1, 3]),
+    ('status not in (OK, NoLabel)', [1, 3, 5]),
+    ('conf_ng', [4]),
+    ('conf_ng==False', [0, 1, 2, 3, 5]),
+    ('lot==00 and plate_confidence<0.5', [0]),
+    ('lot==01 or status==Wrong_Out', [3, 4, 5]),
+    ('not (lot==00 or lot==01)', [5]),
+    ('(lot==00 or lot==01) and not is_first', [1, 2, 4]),
+])
+def test_query_mask(masks, text, expected):
+    assert np.flatnonzero(FilterQuery(text)(masks)).tolist() == expected
+
+
+@pytest.mark.parametrize('text', [
+    'unknown_field==1',
+    'lot==',
+    'lot=="00" and',
+    '(lot=="00"',
+    'plate_confidence=="a"',
+    'plate_confidence<None',
+    'status<OK',
+    'status==Bogus',
+    'status==None',
+    'stop_info==None',
+    'conf_ng==1',
+    'plate_confidence',
+    'lot=="00" $',
+])
+def test_query_error(text):
+    with pytest.raises(QueryError):
+        FilterQuery(text)
@@ -0,0 +1,58 @@
+from app.controllers.meta_cache import MetaCache
+from app.models.parking_info import ParkingInfo
+
+
+def make_row(json_file: str, **values):
+    row = {name: None for name in ('lot', 'is_ps') + ParkingInfo.FIELDS}
+    row.update(lot=json_file.split('_')[1].split('.')[0], is_ps=False, json_file=json_file)
+    row.update(values)
+    return row
+
+
+ROWS = [
+    make_row('a_00.json', timestamp='20250910000001', is_occupied=True, vehicle_status='Stop', lpr_top='品川300', plate_confidence=0.25, plate_xmin=10, plate_ymin=10.5, plate_count=2),
+    None,
+    make_row('c_01.json', timestamp='20250910000003', is_occupied=None, lpr_top='', plate_confidence=1),
+]
+STATS = [('a_00.json', 100, 1), ('b_00.json', 200, 2), ('c_01.json', 300, 3)]
+
+
+def test_round_trip(tmp_path):
+    MetaCache(str(tmp_path)).write(STATS, ROWS)
+
+    cache = MetaCache(str(tmp_path))
+    cache.read()
+    for (json_file, size, mtime), row in zip(STATS, ROWS):
+        hit, record = cache.get(json_file, size, mtime)
+        assert hit
+        assert record == row
+        if record is not None:
+            # JSONで整数だった値は int、小数は float のまま
+            assert [type(record[name]) for name in ('plate_xmin', 'plate_ymin', 'plate_confidence')] == [type(row[name]) for name in ('plate_xmin', 'plate_ymin', 'plate_confidence')]
+
+
+def test_miss_on_changed_file_or_roi(tmp_path):
+    MetaCache(str(tmp_path)).write(STATS, ROWS)
+
+    cache = MetaCache(str(tmp_path))
+    cache.read()
+    assert cache.get('a_00.json', 100, 9) == (False, None)
+    assert cache.get('a_00.json', 101, 1) == (False, None)
+    assert cache.get('d_00.json', 100, 1) == (False, None)
+
+    cache = MetaCache(str(tmp_path), (0, 0, 10, 10))
+    cache.read()
+    assert cache.get('a_00.json', 100, 1) == (False, None)
+
+
+def test_keep_entries_not_in_stats(tmp_path):
+    MetaCache(str(tmp_path)).write(STATS, ROWS)
+
+    cache = MetaCache(str(tmp_path))
+    cache.read()
+    cache.write(STATS[:1], ROWS[:1], keep={'a_00.json', 'c_01.json'})
+
+    cache = MetaCache(str(tmp_path))
+    cache.read()
+    assert sorted(cache.entries) == ['a_00.json', 'c_01.json']
+    assert cache.get('c_01.json', 300, 3) == (True, ROWS[2])